@@ -1,61 +1,154 @@
 """Authentication and security utilities"""
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
+import base64
+import binascii
+import hashlib
+import hmac
+import re
 import secrets
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import threading
+import time
+from cachetools import TTLCache
+import jwt
 from fastapi import HTTPException, status
 from app.config.settings import settings
 
-# Password hashing - Use pbkdf2_sha256 as primary, bcrypt as fallback
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+# HMAC key encoded once rather than on every encode/decode
+_SECRET_BYTES = settings.SECRET_KEY.encode()
+
+# Token lifetimes are fixed for the process
+_ACCESS_TD = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TD = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+# Password hashing - Use pbkdf2_sha256 as primary, bcrypt as fallback.
+# Built on first use: importing passlib and loading the bcrypt backend is slow,
+# and the pbkdf2_sha256 verify fast path below doesn't need it.
+@lru_cache(maxsize=1)
+def _get_pwd_context():
+    """Return the shared passlib CryptContext"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+
+# Verified JWT payloads keyed by SHA-256 of the raw token. Entries are also
+# checked against the token's own "exp" claim so they never outlive the token.
+_payload_cache = TTLCache(maxsize=10_000, ttl=30)
+_payload_cache_lock = threading.Lock()  # sync deps run on FastAPI's threadpool
+
+# Successful (password, hash) verifications so repeated logins skip the KDF.
+# Failures are never cached. Keys are HMACs under a per-process random secret,
+# so a memory dump can't be used as a fast offline check for guessed passwords.
+_pw_cache = TTLCache(maxsize=2048, ttl=60)
+_pw_cache_lock = threading.Lock()
+_PW_CACHE_SECRET = secrets.token_bytes(32)
+
+_PBKDF2_SHA256_PREFIX = "$pbkdf2-sha256$"
+# What passlib accepts: unpadded rounds >= 1, ab64 fields, a 32-byte checksum
+_PBKDF2_SHA256_RE = re.compile(r"([1-9][0-9]*)\$([./A-Za-z0-9]*)\$([./A-Za-z0-9]+)")
+_PBKDF2_SHA256_CHECKSUM_SIZE = 32
+
+def _ab64_decode(data: str) -> bytes:
+    """Decode passlib's adapted base64 ('.' for '+', no padding)"""
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4), validate=True)
+
+def _verify_pbkdf2_sha256(plain_password: str, hashed_password: str) -> Optional[bool]:
+    """Verify a passlib pbkdf2_sha256 hash directly
+    
+    Returns None for anything that isn't a well-formed hash, leaving it to
+    passlib so malformed hashes fail exactly as they always have.
+    """
+    match = _PBKDF2_SHA256_RE.fullmatch(hashed_password, len(_PBKDF2_SHA256_PREFIX))
+    if match is None:
+        return None
+    rounds, salt, checksum = match.groups()
+    try:
+        iterations = int(rounds)
+        salt_bytes = _ab64_decode(salt)
+        expected = _ab64_decode(checksum)
+    except (ValueError, binascii.Error):
+        return None
+    if len(expected) != _PBKDF2_SHA256_CHECKSUM_SIZE or iterations > 0xFFFFFFFF:
+        return None
+    
+    derived = hashlib.pbkdf2_hmac(
+        "sha256", plain_password.encode("utf-8"), salt_bytes, iterations, dklen=len(expected)
+    )
+    return hmac.compare_digest(derived, expected)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     # Apply same truncation as in hashing
     if len(plain_password) > 128:
         plain_password = plain_password[:128]
-    return pwd_context.verify(plain_password, hashed_password)
+    
+    # The hash never contains NUL, so the two parts can't run together
+    key = hmac.digest(
+        _PW_CACHE_SECRET, hashed_password.encode() + b"\0" + plain_password.encode(), "sha256"
+    )
+    with _pw_cache_lock:
+        if key in _pw_cache:
+            return True
+    
+    # Nearly every stored hash is pbkdf2_sha256; check it without passlib's
+    # scheme identification and dispatch. Anything else goes through passlib.
+    verified = None
+    if hashed_password.startswith(_PBKDF2_SHA256_PREFIX):
+        verified = _verify_pbkdf2_sha256(plain_password, hashed_password)
+    if verified is None:
+        verified = _get_pwd_context().verify(plain_password, hashed_password)
+    if not verified:
+        return False
+    
+    with _pw_cache_lock:
+        _pw_cache[key] = True
+    return True
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     # Limit password length to avoid issues (keep reasonable limit)
     if len(password) > 128:
         password = password[:128]
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TD)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT refresh token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = datetime.now(timezone.utc) + (expires_delta or _REFRESH_TD)
     
     to_encode.update({
         "exp": expire,
         "type": "refresh",
         "jti": secrets.token_urlsafe(32)  # Unique token ID for revocation
     })
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt, expire
 
 def verify_token(token: str, token_type: str = "access") -> dict:
     """Verify and decode JWT token"""
+    key = hashlib.sha256(token.encode()).digest()
+    with _payload_cache_lock:
+        payload = _payload_cache.get(key)
+    
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload is None or payload.get("exp", 0) <= time.time():
+            payload = jwt.decode(
+                token, _SECRET_BYTES, algorithms=[settings.ALGORITHM],
+                options={"require": ["exp"]},
+            )
+            # Only verified payloads are cached - never cache on PyJWTError
+            with _payload_cache_lock:
+                _payload_cache[key] = payload
         
         # Verify token type
         if payload.get("type") != token_type:
@@ -65,8 +158,9 @@ def verify_token(token: str, token_type: str = "access") -> dict:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return payload
-    except JWTError:
+        # A copy, so one caller's edits can't leak into the cached payload
+        return dict(payload)
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -1,18 +1,47 @@
 """Database configuration and setup"""
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import QueuePool
 from app.config.settings import settings
 
 # Database configuration - use single source of truth from settings
 DATABASE_URL = settings.DATABASE_URL
+IS_SQLITE = "sqlite" in DATABASE_URL
+
+# Connection pool sizing (in-memory SQLite keeps the default single-connection pool)
+pool_kwargs = {}
+if ":memory:" not in DATABASE_URL:
+    pool_kwargs = {
+        "poolclass": QueuePool,
+        "pool_size": 8,
+        "max_overflow": 16,
+        # A file-backed SQLite connection can't go stale the way a server
+        # socket can, so skip the extra SELECT 1 on every checkout
+        "pool_pre_ping": not IS_SQLITE
+    }
 
 # SQLAlchemy setup
 engine = create_engine(
     DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    insertmanyvalues_page_size=1000,  # rows per multi-VALUES INSERT in bulk inserts
+    **pool_kwargs
 )
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        """Apply performance PRAGMAs on every new SQLite connection"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # readers no longer block the writer
+        cursor.execute("PRAGMA synchronous=NORMAL")  # fsync at checkpoints, not every commit
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        cursor.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -23,3 +52,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def commit_keeping_loaded(db: Session, *instances) -> None:
+    """Commit, keeping the given objects' loaded column values
+    
+    The commit still expires everything else in the session; these objects
+    just don't need a reload SELECT to read back what was written.
+    """
+    db.flush()
+    loaded = []
+    for instance in instances:
+        state = inspect(instance)
+        loaded.append((instance, {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs if attr.key in state.dict
+        }))
+    db.commit()
+    for instance, values in loaded:
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
@@ -1,22 +1,16 @@
 """Application settings and configuration"""
 import os
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet, Optional
 
 class Settings:
-    # Database
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./financial_copilot.db")
-    
     # Security
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 1 month validity for refresh tokens
     
-    # External APIs
-    OLLAMA_HOST: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-    
-    # CORS
-    CORS_ALLOWED_ORIGINS: List[str] = [
+    # CORS - frozenset for O(1) membership checks
+    CORS_ALLOWED_ORIGINS: FrozenSet[str] = frozenset({
         "http://localhost:3000",
         "http://localhost:8080",
         "http://127.0.0.1:3000",
@@ -28,11 +22,35 @@ class Settings:
         "http://192.168.10.1:3000",
         "http://192.168.10.1:8080",
         "*"  # Allow all origins for development
-    ]
+    })
+    CORS_ALLOW_ALL: bool = "*" in CORS_ALLOWED_ORIGINS
     
     # App Info
     APP_NAME: str = "AI Financial Co-Pilot"
     APP_DESCRIPTION: str = "Backend API for the AI-powered financial assistant"
     APP_VERSION: str = "1.0.0"
+    
+    def __init__(self):
+        # Environment-driven values are read once per instance
+        self.DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./financial_copilot.db")
+        self.SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
+        self.OLLAMA_HOST: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        # Optional Unix socket for a local Ollama behind a socket proxy (skips TCP)
+        self.OLLAMA_SOCKET: Optional[str] = os.getenv("OLLAMA_SOCKET") or None
+        self.OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "32"))
+        # SMS parses in flight at once, across all requests; the rest queue.
+        # Ollama decodes OLLAMA_NUM_PARALLEL requests per model at a time (set
+        # on the Ollama server), so keep this at or a little above that value.
+        self.OLLAMA_MAX_CONCURRENT_PARSES: int = int(os.getenv("OLLAMA_MAX_CONCURRENT_PARSES", "8"))
+        # How long Ollama keeps the model (and its prompt cache) loaded between requests
+        self.OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # On-disk LLM parse cache that survives restarts; opt-in, off when unset
+        self.SMS_PARSE_CACHE_PATH: Optional[str] = os.getenv("SMS_PARSE_CACHE_PATH") or None
+        self.SMS_PARSE_CACHE_DAYS: int = int(os.getenv("SMS_PARSE_CACHE_DAYS", "30"))
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings singleton"""
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
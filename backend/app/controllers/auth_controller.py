@@ -1,6 +1,8 @@
 """Authentication controller for user management"""
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.config.database import commit_keeping_loaded
 from app.models.user import User
 from app.auth.security import (
     get_password_hash, 
@@ -9,17 +11,31 @@ from app.auth.security import (
     create_refresh_token,
     verify_token
 )
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
 from app.config.settings import settings
 
+# Stored refresh tokens are reused on login while they have this long left
+_REFRESH_REUSE_MARGIN = timedelta(days=1)
+
+# Profile columns a user may change on themselves; credentials, tokens and
+# account status are managed by their own flows
+_USER_UPDATABLE_COLUMNS = frozenset({'email', 'username', 'full_name'})
+
+# Columns served by UserResponse
+_USER_RESPONSE_COLUMNS = (
+    User.id, User.email, User.username, User.full_name, User.is_active, User.is_verified
+)
+
 class AuthController:
     @staticmethod
     def create_user(db: Session, email: str, username: str, password: str, full_name: str = None) -> User:
         """Create a new user"""
-        # Check if user already exists
-        existing_user = db.query(User).filter(
-            (User.email == email) | (User.username == username)
-        ).first()
+        # Check if user already exists - two indexed lookups instead of an OR
+        # across columns, which SQLite's planner often turns into a table scan
+        existing_user = (
+            db.query(User.id).filter(User.email == email).first()
+            or db.query(User.id).filter(User.username == username).first()
+        )
         
         if existing_user:
             raise HTTPException(
@@ -39,16 +55,17 @@ class AuthController:
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        commit_keeping_loaded(db, db_user)
         return db_user
     
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> User:
         """Authenticate user with username/email and password"""
-        user = db.query(User).filter(
-            (User.username == username) | (User.email == username)
-        ).first()
+        # Each lookup hits the unique index on its column
+        user = (
+            db.query(User).filter(User.username == username).first()
+            or db.query(User).filter(User.email == username).first()
+        )
         
         if not user or not verify_password(password, user.hashed_password):
             raise HTTPException(
@@ -65,32 +82,59 @@ class AuthController:
         
         return user
     
+    @staticmethod
+    def _reusable_refresh_token(user: User):
+        """Return the user's stored refresh token and its expiry if it is still valid for over a day"""
+        expires_at = user.refresh_token_expires_at
+        if not user.refresh_token or not expires_at:
+            return None
+        
+        # SQLite hands back naive datetimes, which are stored as UTC
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at - datetime.now(timezone.utc) <= _REFRESH_REUSE_MARGIN:
+            return None
+        
+        try:
+            verify_token(user.refresh_token, token_type="refresh")
+        except HTTPException:
+            return None
+        return user.refresh_token, expires_at
+    
     @staticmethod
     def create_access_token_for_user(user: User, db: Session) -> dict:
         """Create access and refresh tokens for authenticated user"""
         # Create access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id), "username": user.username},
-            expires_delta=access_token_expires
-        )
-        
-        # Create refresh token
-        refresh_token, refresh_expires = create_refresh_token(
             data={"sub": str(user.id), "username": user.username}
         )
         
-        # Store refresh token in database
-        user.refresh_token = refresh_token
-        user.refresh_token_expires_at = refresh_expires
-        db.commit()
+        # Reuse the stored refresh token while it has more than a day left,
+        # so a re-login costs no JWT encode and no database write
+        reusable = AuthController._reusable_refresh_token(user)
+        if reusable is not None:
+            refresh_token, refresh_expires = reusable
+        else:
+            refresh_token, refresh_expires = create_refresh_token(
+                data={"sub": str(user.id), "username": user.username}
+            )
+            
+            # Store refresh token with a single targeted UPDATE rather than
+            # an ORM flush of the whole user; the session copy is synced in place
+            db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(refresh_token=refresh_token, refresh_token_expires_at=refresh_expires)
+            )
+            commit_keeping_loaded(db, user)
         
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer",
             "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            "refresh_expires_in": settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,  # seconds
+            # seconds left on the token actually returned, which may be a reused one
+            "refresh_expires_in": int((refresh_expires - datetime.now(timezone.utc)).total_seconds()),
             "user": {
                 "id": user.id,
                 "username": user.username,
@@ -113,19 +157,33 @@ class AuthController:
         return user
     
     @staticmethod
-    def update_user(db: Session, user_id: int, **kwargs) -> User:
-        """Update user information"""
-        user = AuthController.get_user_by_id(db, user_id)
-        
-        for key, value in kwargs.items():
-            if hasattr(user, key) and value is not None:
-                if key == "password":
-                    user.hashed_password = get_password_hash(value)
-                else:
-                    setattr(user, key, value)
+    def update_user(db: Session, user_id: int, **kwargs):
+        """Update user information with a single UPDATE ... RETURNING
+        
+        Returns a row of the UserResponse columns whether or not anything changed.
+        """
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in _USER_UPDATABLE_COLUMNS and value is not None
+        }
+        if values:
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**values)
+                .returning(*_USER_RESPONSE_COLUMNS)
+            )
+        else:
+            stmt = select(*_USER_RESPONSE_COLUMNS).where(User.id == user_id)
         
+        user = db.execute(stmt).one_or_none()
+        if user is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
         db.commit()
-        db.refresh(user)
         return user
     
     @staticmethod
@@ -141,28 +199,22 @@ class AuthController:
                 detail="Invalid refresh token"
             )
         
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Primary-key lookup; served from the session's identity map when possible
+        user = db.get(User, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
         
-        # Check if refresh token matches stored token
+        # Check if refresh token matches stored token (revocation). Expiry is
+        # already enforced by the JWT "exp" claim in verify_token.
         if user.refresh_token != refresh_token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
         
-        # Check if refresh token is expired
-        if user.refresh_token_expires_at and user.refresh_token_expires_at < datetime.utcnow():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token expired"
-            )
-        
         # Check if user is still active
         if not user.is_active:
             raise HTTPException(
@@ -171,10 +223,8 @@ class AuthController:
             )
         
         # Create new access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id), "username": user.username},
-            expires_delta=access_token_expires
+            data={"sub": str(user.id), "username": user.username}
         )
         
         return {
@@ -2,32 +2,139 @@
 Chatbot Controller for Financial Transaction Queries
 Provides intelligent responses to user queries about their transaction data
 """
-import json
-import requests
-from typing import List, Dict, Any
+import re
+import httpx
+import orjson
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 from app.models.transaction import Transaction
 from app.config.settings import settings
+from app.utils.ollama_client import get_ollama_client
 
+# Query keyword sets for the built-in analytics responses (matched by token)
+SPEND_KW = frozenset({'spend', 'spent', 'spending', 'spends', 'total', 'much'})
+MONTH_KW = frozenset({'month', 'months', 'monthly'})
+CAT_KW = frozenset({'category', 'categories', 'breakdown'})
+VENDOR_KW = frozenset({'vendor', 'vendors', 'merchant', 'merchants', 'shop', 'shops', 'shopping', 'store', 'stores'})
+AVG_KW = frozenset({'average'})
+_WORD_RE = re.compile(r"[a-z]+")
 
-def format_transactions_for_prompt(transactions: List[Transaction]) -> str:
-    """Formats a list of transaction objects into a string for the LLM prompt."""
-    if not transactions:
-        return "No transactions found."
+# Clearly off-topic requests get the default answer without an LLM round
+# trip - unless they also mention money, which the LLM should then handle
+_OUT_OF_SCOPE_RE = re.compile(
+    r"\b(jokes?|weather|poems?|poetry|stor(y|ies)|songs?|lyrics|movies?|films?|recipes?|"
+    r"cricket|football|sports?|news|translate|riddles?|horoscope|who are you|your name)\b",
+    re.I
+)
+_FINANCE_RE = re.compile(
+    r"\b(spen[dt]\w*|total|categor\w*|vendor\w*|merchant\w*|average|budget\w*|income|"
+    r"expense\w*|earn\w*|sav(e|es|ed|ing|ings)|transaction\w*|money|paid|pay\w*|"
+    r"cost\w*|bill\w*|insight\w*|financ\w*|rent|salary|purchase\w*|bought|buy\w*|"
+    r"order\w*|food|grocer\w*|shopping|bank\w*|credit\w*|debit\w*|upi|emi|loan\w*|"
+    r"subscription\w*|cash|balance|refund\w*|invest\w*|tax\w*|fees?|charges?|price\w*|"
+    r"afford|owe\w*|rs|inr|rupees?)\b",
+    re.I
+)
+
+
+def _is_out_of_scope(query: str) -> bool:
+    """True for requests that are plainly not about the user's finances"""
+    return bool(_OUT_OF_SCOPE_RE.search(query)) and not _FINANCE_RE.search(query)
+
+def _aggregate_transactions(transactions: List[Transaction]) -> Dict[str, Any]:
+    """Compute all spending aggregates in a single pass over the transactions."""
+    total_spent = 0.0
+    total_earned = 0.0
+    debit_count = 0
+    categories = defaultdict(float)
+    vendors = defaultdict(float)
     
-    transaction_lines = []
     for t in transactions:
-        # Format transaction data for the AI
-        # Use transaction_type from model
-        transaction_type = t.transaction_type if t.transaction_type else "debit"
-        transaction_lines.append(
-            f"- Date: {t.date}, "
-            f"Vendor: {t.vendor}, "
-            f"Amount: ₹{t.amount:.2f}, "
-            f"Type: {transaction_type}, "
-            f"Category: {t.category}"
-        )
+        transaction_type = t.transaction_type
+        amount = t.amount
+        if transaction_type == 'debit':
+            total_spent += amount
+            debit_count += 1
+            categories[t.category] += amount
+            vendors[t.vendor] += amount
+        elif transaction_type == 'credit':
+            total_earned += amount
+    
+    return {
+        "total_spent": total_spent,
+        "total_earned": total_earned,
+        "debit_count": debit_count,
+        "transaction_count": len(transactions),
+        "categories": dict(categories),
+        "vendors": dict(vendors)
+    }
+
+
+def _user_aggregates(db: Session, user_id: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Compute the same aggregates as _aggregate_transactions with a single
+    GROUP BY in the database, optionally over only the `limit` most recent rows.
+    """
+    rows = db.query(Transaction)
+    if user_id is not None:
+        rows = rows.filter(Transaction.user_id == user_id)
+    if limit is not None:
+        rows = rows.order_by(Transaction.date.desc()).limit(limit)
+    rows = rows.with_entities(
+        Transaction.transaction_type, Transaction.category, Transaction.vendor, Transaction.amount
+    ).subquery()
+    
+    groups = db.query(
+        rows.c.transaction_type,
+        rows.c.category,
+        rows.c.vendor,
+        func.sum(rows.c.amount).label('total'),
+        func.count().label('n')
+    ).group_by(rows.c.transaction_type, rows.c.category, rows.c.vendor).all()
+    
+    total_spent = 0.0
+    total_earned = 0.0
+    debit_count = 0
+    transaction_count = 0
+    categories = defaultdict(float)
+    vendors = defaultdict(float)
+    
+    for transaction_type, category, vendor, total, n in groups:
+        transaction_count += n
+        total = total or 0.0
+        if transaction_type == 'debit':
+            total_spent += total
+            debit_count += n
+            categories[category] += total
+            vendors[vendor] += total
+        elif transaction_type == 'credit':
+            total_earned += total
     
-    return "\n".join(transaction_lines)
+    return {
+        "total_spent": total_spent,
+        "total_earned": total_earned,
+        "debit_count": debit_count,
+        "transaction_count": transaction_count,
+        "categories": dict(categories),
+        "vendors": dict(vendors)
+    }
+
+
+def format_transactions_for_prompt(rows) -> str:
+    """
+    Formats transaction rows into a string for the LLM prompt.
+    Rows are (date, vendor, amount, transaction_type, category) tuples.
+    """
+    if not rows:
+        return "No transactions found."
+    
+    # Use transaction_type from model, defaulting to debit
+    return "\n".join(
+        f"- Date: {d}, Vendor: {v}, Amount: ₹{a:.2f}, Type: {tt or 'debit'}, Category: {c}"
+        for d, v, a, tt, c in rows
+    )
 
 
 async def get_ollama_response(prompt: str) -> str:
@@ -41,16 +148,17 @@ async def get_ollama_response(prompt: str) -> str:
             "stream": False
         }
         
-        response = requests.post(
-            f"{settings.OLLAMA_HOST}/api/generate",
-            json=payload,
+        response = await get_ollama_client().post(
+            "/api/generate",
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
             timeout=120  # Increased timeout
         )
         
         print(f"🤖 Ollama response status: {response.status_code}")
         
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             ai_response = response_data.get('response', 'Sorry, I could not process your request.')
             print(f"🤖 AI Response length: {len(ai_response)} characters")
             return ai_response
@@ -59,11 +167,11 @@ async def get_ollama_response(prompt: str) -> str:
             print(f"❌ {error_msg}")
             return f"Sorry, I'm having trouble connecting to the AI service. (Status: {response.status_code})"
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         error_msg = "Ollama request timed out"
         print(f"❌ {error_msg}")
         return "Sorry, the AI is taking too long to respond. Please try a simpler question."
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         error_msg = "Cannot connect to Ollama service"
         print(f"❌ {error_msg}")
         return "Sorry, I can't connect to the AI service. Please make sure Ollama is running."
@@ -73,24 +181,41 @@ async def get_ollama_response(prompt: str) -> str:
         return f"Sorry, I encountered an error: {str(e)}"
 
 
-async def get_chatbot_response(query: str, transactions: List[Transaction]) -> Dict[str, Any]:
+async def get_chatbot_response(query: str, db: Session, user_id: Optional[int] = None,
+                               limit: Optional[int] = None) -> Dict[str, Any]:
     """
     Generates a response to a user's query based on their transaction history.
+    Aggregates are computed in the database; rows are only loaded for the AI prompt.
     """
+    stats = _user_aggregates(db, user_id=user_id, limit=limit)
+    transaction_count = stats["transaction_count"]
+    
     # First try to answer with simple analytics
-    simple_response = generate_simple_response(query, transactions)
+    simple_response = _simple_response_from_stats(query, stats)
     if simple_response:
         return {
             "response": simple_response,
-            "transaction_count": len(transactions),
+            "transaction_count": transaction_count,
             "query": query,
             "source": "analytics",  # Indicates response from built-in analytics
             "source_description": "Built-in Analytics"
         }
     
+    # Out-of-scope queries get the default answer without an Ollama call
+    if _is_out_of_scope(query):
+        return _fallback_response(query, transaction_count)
+    
     # If simple response doesn't work, try AI (with timeout protection)
     try:
-        formatted_transactions = format_transactions_for_prompt(transactions[:10])  # Limit to 10 transactions
+        # Plain column tuples - no ORM instances are built for the prompt rows
+        recent = db.query(
+            Transaction.date, Transaction.vendor, Transaction.amount,
+            Transaction.transaction_type, Transaction.category
+        )
+        if user_id is not None:
+            recent = recent.filter(Transaction.user_id == user_id)
+        recent = recent.order_by(Transaction.date.desc()).limit(10).all()  # Limit to 10 transactions
+        formatted_transactions = format_transactions_for_prompt(recent)
         
         # Create a very concise prompt
         prompt = f"""
@@ -106,68 +231,71 @@ Keep under 100 words. Use ₹ for currency.
         
         return {
             "response": response,
-            "transaction_count": len(transactions),
+            "transaction_count": transaction_count,
             "query": query,
             "source": "ai_model",  # Indicates response from AI model
             "source_description": "Ollama AI (mistral:7b-instruct-q4_K_M)"
         }
     except:
         # Fallback to simple response
-        return {
-            "response": f"I found {len(transactions)} transactions in your account. You can ask me about spending patterns, categories, or specific vendors. For example: 'How much did I spend on food?' or 'What's my biggest expense?'",
-            "transaction_count": len(transactions),
-            "query": query,
-            "source": "fallback",  # Indicates fallback response
-            "source_description": "Default Response"
-        }
+        return _fallback_response(query, transaction_count)
+
+
+def _fallback_response(query: str, transaction_count: int) -> Dict[str, Any]:
+    """Default answer when neither analytics nor the AI model can respond"""
+    return {
+        "response": f"I found {transaction_count} transactions in your account. You can ask me about spending patterns, categories, or specific vendors. For example: 'How much did I spend on food?' or 'What's my biggest expense?'",
+        "transaction_count": transaction_count,
+        "query": query,
+        "source": "fallback",  # Indicates fallback response
+        "source_description": "Default Response"
+    }
 
 
 def generate_simple_response(query: str, transactions: List[Transaction]) -> str:
     """Generate simple responses without AI for common queries"""
-    query_lower = query.lower()
+    # Calculate basic stats using transaction_type (single pass)
+    return _simple_response_from_stats(query, _aggregate_transactions(transactions))
+
+
+def _simple_response_from_stats(query: str, stats: Dict[str, Any]) -> Optional[str]:
+    """Answer common queries from precomputed aggregates"""
+    tokens = set(_WORD_RE.findall(query.lower()))
     
-    if not transactions:
+    if not stats["transaction_count"]:
         return "I don't see any transactions yet. Once you add some transactions, I'll be able to help analyze your spending!"
     
-    # Calculate basic stats using transaction_type
-    total_spent = sum(t.amount for t in transactions if t.transaction_type == 'debit')
-    total_earned = sum(t.amount for t in transactions if t.transaction_type == 'credit')
-    
-    # Category breakdown
-    categories = {}
-    vendors = {}
-    for t in transactions:
-        if t.transaction_type == 'debit':  # Debit transactions
-            categories[t.category] = categories.get(t.category, 0) + t.amount
-            vendors[t.vendor] = vendors.get(t.vendor, 0) + t.amount
+    total_spent = stats["total_spent"]
+    total_earned = stats["total_earned"]
+    debit_count = stats["debit_count"]
+    categories = stats["categories"]
+    vendors = stats["vendors"]
     
     # Common query patterns
-    if any(word in query_lower for word in ['spend', 'spent', 'total', 'much']):
-        if 'month' in query_lower:
+    if tokens & SPEND_KW:
+        if tokens & MONTH_KW:
             return f"Based on your recent transactions, you've spent ₹{total_spent:.2f} and earned ₹{total_earned:.2f}. Your net spending is ₹{total_spent - total_earned:.2f}."
         else:
-            return f"You've spent ₹{total_spent:.2f} across {len([t for t in transactions if t.transaction_type == 'debit'])} transactions."
+            return f"You've spent ₹{total_spent:.2f} across {debit_count} transactions."
     
-    if any(word in query_lower for word in ['category', 'categories', 'breakdown']):
+    if tokens & CAT_KW:
         if categories:
             top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:3]
             response = "Your top spending categories are: "
             response += ", ".join([f"{cat}: ₹{amt:.2f}" for cat, amt in top_categories])
             return response
     
-    if any(word in query_lower for word in ['vendor', 'merchant', 'shop', 'store']):
+    if tokens & VENDOR_KW:
         if vendors:
             top_vendors = sorted(vendors.items(), key=lambda x: x[1], reverse=True)[:3]
             response = "You spend the most at: "
             response += ", ".join([f"{vendor}: ₹{amt:.2f}" for vendor, amt in top_vendors])
             return response
     
-    if 'average' in query_lower:
-        if transactions:
-            debit_transactions = [t for t in transactions if t.transaction_type == 'debit']
-            if debit_transactions:
-                avg_amount = total_spent / len(debit_transactions)
-                return f"Your average transaction amount is ₹{avg_amount:.2f}."
+    if tokens & AVG_KW:
+        if debit_count:
+            avg_amount = total_spent / debit_count
+            return f"Your average transaction amount is ₹{avg_amount:.2f}."
     
     return None  # Let AI handle complex queries
 
@@ -183,14 +311,15 @@ async def get_ollama_response_fast(prompt: str) -> str:
             "stream": False
         }
         
-        response = requests.post(
-            f"{settings.OLLAMA_HOST}/api/generate",
-            json=payload,
+        response = await get_ollama_client().post(
+            "/api/generate",
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
             timeout=30  # Shorter timeout
         )
         
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             return response_data.get('response', 'I can help you analyze your transactions. Try asking about spending categories or amounts.')
         else:
             return "I can help you analyze your transactions. Try asking about spending categories or amounts."
@@ -200,28 +329,20 @@ async def get_ollama_response_fast(prompt: str) -> str:
         return "I can help you analyze your transactions. Try asking about spending categories or amounts."
 
 
-async def get_spending_summary(transactions: List[Transaction]) -> Dict[str, Any]:
+async def get_spending_summary(db: Session, user_id: Optional[int] = None,
+                               limit: Optional[int] = None) -> Dict[str, Any]:
     """Generate a spending summary for the chatbot context"""
-    if not transactions:
+    # Aggregated with a single GROUP BY in the database
+    stats = _user_aggregates(db, user_id=user_id, limit=limit)
+    if not stats["transaction_count"]:
         return {"total_spent": 0, "categories": {}, "recent_count": 0}
     
-    # Calculate basic statistics using transaction_type
-    total_spent = sum(t.amount for t in transactions if t.transaction_type == 'debit')
-    total_earned = sum(t.amount for t in transactions if t.transaction_type == 'credit')
-    
-    # Category breakdown
-    categories = {}
-    for t in transactions:
-        if t.transaction_type == 'debit':  # Only count expenses
-            if t.category in categories:
-                categories[t.category] += t.amount
-            else:
-                categories[t.category] = t.amount
+    categories = stats["categories"]
     
     return {
-        "total_spent": total_spent,
-        "total_earned": total_earned,
+        "total_spent": stats["total_spent"],
+        "total_earned": stats["total_earned"],
         "categories": categories,
-        "transaction_count": len(transactions),
+        "transaction_count": stats["transaction_count"],
         "top_category": max(categories.items(), key=lambda x: x[1])[0] if categories else "None"
     }
@@ -1,22 +1,185 @@
 """Transaction controller for business logic"""
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+from cachetools import TTLCache
+from sqlalchemy import Row, column, delete, exists, insert, literal, or_, select, table, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
-from typing import List, Dict, Any, Optional
+from fastapi import HTTPException
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
-from app.models.transaction import Transaction, Category
-from app.models.user import User
+from app.models.transaction import Transaction, Category, SEARCH_INDEX_TABLE
 from app.utils.sms_parser import SMSParser
 from app.utils.ollama_integration import OllamaAssistant
-from app.utils.transaction_deduplicator import TransactionDeduplicator
+from app.utils.transaction_deduplicator import TransactionDeduplicator, sms_digest
 from app.utils.sms_classifier import classify_and_parse_sms
 from app.utils.intelligent_sms_filter import IntelligentSMSFilter, SMSType
+from app.utils.parse_result_store import ParseResultStore
+from app.utils.sms_template import template_key, make_template, fill_template
+from app.config.settings import settings
+from app.config.database import commit_keeping_loaded
+
+# YYYY-MM-DD with an optional time (ISO "T" or space separated); anything
+# after the seconds - fractions, timezone offsets - is ignored
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?)?')
+
+# Columns served by the transaction responses (list/search/parse/create).
+# Selecting or RETURNING plain rows skips ORM identity-map and
+# instrumentation work for every transaction served.
+_LISTING_COLUMNS = (
+    Transaction.id, Transaction.vendor, Transaction.amount, Transaction.date,
+    Transaction.category, Transaction.sms_text, Transaction.confidence
+)
+
+# Columns a client may change through update_transaction; the key and
+# owner are fixed, and sms_digest follows sms_text
+_UPDATABLE_COLUMNS = frozenset(Transaction.__table__.columns.keys()) - {'id', 'user_id', 'sms_digest'}
+
+# SQLite FTS5 trigram index over vendor/category (see the Transaction model)
+_SEARCH_INDEX = table(SEARCH_INDEX_TABLE, column('rowid'))
+# Trigram MATCH needs at least this many characters to find anything
+_SEARCH_INDEX_MIN_CHARS = 3
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+@lru_cache(maxsize=4096)
+def _match_date(date: str) -> Optional[datetime]:
+    """Regex-parse a date string, or None if it isn't one.
+    
+    Memoized: a batch carries the same few dates over and over, and the
+    result doesn't depend on the current time.
+    """
+    m = _DATE_RE.match(date)
+    if not m:
+        return None
+    year, month, day, hour, minute, second = m.groups()
+    try:
+        return datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0)
+        )
+    except ValueError:
+        # Out-of-range field such as month 13
+        return None
+
+
+def _parse_transaction_date(date, now: Optional[datetime] = None) -> datetime:
+    """Parse a transaction date string (ISO or YYYY-MM-DD), clamping future years
+    
+    ``now`` lets batch callers read the clock once for every row.
+    """
+    now = now or datetime.now()
+    if isinstance(date, str):
+        transaction_date = _match_date(date)
+    elif isinstance(date, datetime):
+        transaction_date = date
+    else:
+        transaction_date = None
+    
+    # Fallback to current date if parsing fails
+    if transaction_date is None:
+        return now
+    
+    # Validate date - if it's in the future, adjust it to current year
+    if transaction_date.year > now.year:
+        transaction_date = transaction_date.replace(year=now.year)
+    return transaction_date
+
 
 class TransactionController:
-    def __init__(self):
-        self.sms_parser = SMSParser()
-        self.ai_assistant = OllamaAssistant()
+    def __init__(self, ai_assistant: Optional[OllamaAssistant] = None):
+        # LLM used when the SMS classifier cannot parse a message; injectable
+        # so another backend (or a stub) can be chosen at startup
+        self.ai_assistant = ai_assistant or OllamaAssistant()
         self.deduplicator = TransactionDeduplicator()
         self.intelligent_filter = IntelligentSMSFilter()
+        # Successful LLM parses keyed by SMS text digest; bank templates repeat,
+        # so identical messages skip the Ollama round-trip entirely. A parse of
+        # a fixed text never changes, so entries can live for a day.
+        self._sms_cache = TTLCache(maxsize=10_000, ttl=86400)
+        # On-disk copy of those parses, so a restart doesn't send every
+        # recurring template back to the LLM
+        self._sms_store = (
+            ParseResultStore(settings.SMS_PARSE_CACHE_PATH, settings.SMS_PARSE_CACHE_DAYS)
+            if settings.SMS_PARSE_CACHE_PATH else None
+        )
+        # Templates learned from those parses, keyed by the SMS with its
+        # numbers masked: the next alert from the same bank and merchant
+        # reuses the parse with its own amount, date and reference
+        self._template_cache = TTLCache(maxsize=10_000, ttl=86400)
+        # Parses currently with the LLM, so concurrent copies of one SMS (a
+        # batch, or a client retrying) share a single call. Keyed per event
+        # loop too: a task can only be awaited on the loop that runs it.
+        self._sms_inflight: Dict[Tuple[asyncio.AbstractEventLoop, bytes], asyncio.Task] = {}
+        # Categories are a small, rarely-changing set. create_category clears
+        # this worker's copy; the TTL bounds staleness from other workers.
+        self._categories_cache = TTLCache(maxsize=1, ttl=300)
+    
+    async def _classify_and_parse_cached(self, sms_text: str) -> Dict[str, Any]:
+        """classify_and_parse_sms behind the exact-text and template parse caches"""
+        # Whitespace differences (line breaks, double spaces) don't change the parse
+        normalized = ' '.join(sms_text.split())
+        key = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        cached = self._cached_parse(self._sms_cache, key)
+        if cached is not None:
+            return cached
+        # Personalized so template keys never collide with exact-text keys in the store
+        template_digest = hashlib.blake2b(
+            template_key(normalized).encode(), digest_size=16, person=b'sms-template'
+        ).digest()
+        template = self._cached_parse(self._template_cache, template_digest)
+        if template is not None:
+            filled = fill_template(template, normalized)
+            if filled is not None:
+                return filled
+        
+        inflight_key = (asyncio.get_running_loop(), key)
+        task = self._sms_inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(classify_and_parse_sms(normalized))
+            self._sms_inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._sms_inflight.pop(inflight_key, None))
+        # Shielded so one cancelled caller doesn't cancel the parse for the rest
+        parsed_result = await asyncio.shield(task)
+        # Never cache failures (an unreachable LLM yields no amount) - the
+        # next attempt may succeed
+        if parsed_result.get('success') is not False and parsed_result.get('amount') is not None:
+            self._cache_parse(self._sms_cache, key, parsed_result)
+            template = make_template(parsed_result, normalized)
+            if template is not None:
+                self._cache_parse(self._template_cache, template_digest, template)
+        return parsed_result
+    
+    def _cached_parse(self, cache: TTLCache, key: bytes) -> Optional[Dict[str, Any]]:
+        """Look ``key`` up in ``cache``, then in the on-disk store"""
+        cached = cache.get(key)
+        if cached is None and self._sms_store is not None:
+            cached = self._sms_store.get(key)
+            if cached is not None:
+                cache[key] = cached
+        return cached
+    
+    def _cache_parse(self, cache: TTLCache, key: bytes, value: Dict[str, Any]):
+        """Remember ``value`` in ``cache`` and, if it is new here, on disk"""
+        if key not in cache and self._sms_store is not None:
+            self._sms_store.set(key, value)
+        cache[key] = value
+    
+    @staticmethod
+    def _duplicate_error(row: Dict[str, Any]) -> str:
+        """Why create_enhanced_transaction skipped ``row``"""
+        if row['fingerprint']:
+            return "Duplicate SMS (fingerprint match)"
+        return "SMS already processed for this user"
+    
+    @staticmethod
+    def _rejected(reason: str, error: str) -> Dict[str, Any]:
+        """parse_sms result for an SMS that was deliberately not stored"""
+        return {'success': False, 'reason': reason, 'error': error}
     
     async def parse_sms(
         self, 
@@ -26,7 +189,51 @@ class TransactionController:
         sender: Optional[str] = None,
         device_timestamp: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Parse SMS with temporal-context aware deduplication and LLM parsing"""
+        """Parse SMS with temporal-context aware deduplication and LLM parsing
+        
+        Duplicates, non-transaction SMS and low-confidence parses are expected
+        outcomes, returned as ``success: False`` with a ``reason`` and ``error``
+        rather than raised.
+        """
+        now = datetime.now()  # Shared by the date fallback and timestamps
+        prepared = await self.prepare_llm_transaction(
+            db, sms_text, user_id=user_id, sender=sender, device_timestamp=device_timestamp, now=now
+        )
+        if not prepared['success']:
+            return prepared
+        row = prepared.pop('row')
+        
+        # Create transaction with fingerprint and temporal data
+        transaction = self.create_enhanced_transaction(
+            db=db, unique_sms_text=not row['fingerprint'], now=now, **row
+        )
+        if transaction is None:
+            return self._rejected('duplicate', self._duplicate_error(row))
+        
+        # Add to in-memory deduplicator
+        self._remember_transaction(row, now=now)
+        
+        prepared['transaction'] = transaction
+        return prepared
+    
+    async def prepare_llm_transaction(
+        self,
+        db: Session,
+        sms_text: str,
+        user_id: Optional[int] = None,
+        sender: Optional[str] = None,
+        device_timestamp: Optional[int] = None,
+        preloaded: Optional[Dict[str, set]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Filter, LLM-parse and dedup one SMS without storing it
+        
+        On success returns ``{'success': True, 'row': <create_enhanced_transaction
+        kwargs>, 'method': ...}``; otherwise a parse_sms rejection. With
+        ``preloaded`` (TransactionDeduplicator.preload sets) no DB query is made,
+        so a batch can prepare many SMS concurrently on one session. ``now``
+        dates SMS that carry no date of their own.
+        """
         try:
             # STEP 0: FAST fingerprint check BEFORE any expensive processing
             fingerprint = None
@@ -38,21 +245,34 @@ class TransactionController:
                 )
                 
                 # Fast indexed DB query - O(log n)
-                if self.deduplicator.is_duplicate_by_fingerprint(fingerprint, db):
-                    raise ValueError("Duplicate SMS (fingerprint match)")
+                if preloaded is not None:
+                    is_duplicate = fingerprint in preloaded['fingerprints']
+                else:
+                    is_duplicate = self.deduplicator.is_duplicate_by_fingerprint(fingerprint, db)
+                if is_duplicate:
+                    return self._rejected('duplicate', "Duplicate SMS (fingerprint match)")
                 
                 # Convert device timestamp to datetime for date fallback
                 device_datetime = datetime.fromtimestamp(device_timestamp / 1000.0)
             
-            # STEP 1: Intelligent pre-filtering to identify real transactions
-            sms_type, confidence, reason = self.intelligent_filter.classify_sms(sms_text)
-            
-            # Only process if it's a real transaction with high confidence
-            if sms_type != SMSType.REAL_TRANSACTION or confidence < 0.6:
-                raise ValueError(f"SMS filtered out: {sms_type.value} (confidence: {confidence:.2f}) - {reason}")
-            
-            # STEP 2: Use advanced SMS classification and parsing
-            parsed_result = await classify_and_parse_sms(sms_text)
+            # STEP 1: Known bank templates are real transactions that parse
+            # exactly with a regex, so they skip the filter and the LLM
+            parsed_result = SMSParser.fast_match(sms_text)
+            method = 'template'
+            if parsed_result is None:
+                # Intelligent pre-filtering to identify real transactions
+                sms_type, confidence, reason = self.intelligent_filter.classify_sms(sms_text)
+                
+                # Only process if it's a real transaction with high confidence
+                if sms_type != SMSType.REAL_TRANSACTION or confidence < 0.6:
+                    return self._rejected(
+                        'filtered',
+                        f"SMS filtered out: {sms_type.value} (confidence: {confidence:.2f}) - {reason}"
+                    )
+                
+                # STEP 2: Use advanced SMS classification and parsing
+                parsed_result = await self._classify_and_parse_cached(sms_text)
+                method = 'advanced_classifier'
             
             if parsed_result.get('success') is False:
                 raise ValueError(f"SMS parsing failed: {parsed_result.get('error', 'Unknown error')}")
@@ -70,11 +290,11 @@ class TransactionController:
                 if device_datetime:
                     date_str = device_datetime.strftime('%Y-%m-%d %H:%M:%S')
                 else:
-                    date_str = datetime.now().strftime('%Y-%m-%d')
+                    date_str = (now or datetime.now()).strftime('%Y-%m-%d')
             
             # Apply confidence threshold filtering
             if confidence < 0.7:
-                raise ValueError(f"Low confidence transaction ({confidence:.2f})")
+                return self._rejected('low_confidence', f"Low confidence transaction ({confidence:.2f})")
             
             # Legacy dedup check (fallback if no fingerprint)
             if not fingerprint:
@@ -90,76 +310,62 @@ class TransactionController:
                 
                 duplicate_result = self.deduplicator.is_duplicate(duplicate_check_data)
                 if duplicate_result['is_duplicate']:
-                    raise ValueError(f"Duplicate transaction: {duplicate_result['reason']}")
+                    return self._rejected('duplicate', f"Duplicate transaction: {duplicate_result['reason']}")
                 
-                # Also check database for existing SMS text
-                from app.models.transaction import Transaction
-                existing = db.query(Transaction).filter(
-                    Transaction.sms_text == sms_text,
-                    Transaction.user_id == user_id
-                ).first()
-                if existing:
-                    raise ValueError("SMS already processed for this user")
-            
-            # Create transaction with fingerprint and temporal data
-            transaction = self.create_enhanced_transaction(
-                db=db,
-                vendor=vendor,
-                amount=amount,
-                date=date_str,
-                category=category,
-                sms_text=sms_text,
-                confidence=confidence,
-                parsed_data=parsed_result,
-                user_id=user_id,
-                fingerprint=fingerprint,
-                device_received_at=device_datetime,
-                sender_address=sender
-            )
-            
-            # Add to in-memory deduplicator
-            self.deduplicator.add_transaction({
-                'vendor': vendor, 'amount': amount, 'date': date_str,
-                'transaction_type': transaction_type, 'sms_text': sms_text
-            })
+                # A batch checks its preloaded SMS texts; a single SMS is
+                # checked by the INSERT itself (unique_sms_text)
+                if preloaded is not None and sms_text in preloaded['sms_texts']:
+                    return self._rejected('duplicate', "SMS already processed for this user")
             
             return {
                 'success': True,
-                'transaction': transaction,
-                'method': 'advanced_classifier',
+                'row': {
+                    'vendor': vendor,
+                    'amount': amount,
+                    'date': date_str,
+                    'category': category,
+                    'sms_text': sms_text,
+                    'confidence': confidence,
+                    'parsed_data': parsed_result,
+                    'user_id': user_id,
+                    'fingerprint': fingerprint,
+                    'device_received_at': device_datetime,
+                    'sender_address': sender
+                },
+                'method': method,
                 'classification': parsed_result.get('payment_method', 'Unknown')
             }
                 
         except ValueError as e:
-            # Fallback to old parsing method if new method fails
+            # Fallback to old parsing method if the classifier could not parse it
             try:
                 if self.ai_assistant.initialized:
-                    ai_result = self.ai_assistant.parse_sms_transaction(sms_text)
+                    ai_result = await self.ai_assistant.parse_sms_transaction(sms_text)
                     
                     if ai_result['success']:
                         transaction_data = ai_result['transaction_data']
                         
                         # Format date properly if provided
                         if transaction_data.get('date') and transaction_data['date'] != 'null':
-                            date_str = self.sms_parser.format_date(transaction_data['date'])
+                            date_str = SMSParser.format_date(transaction_data['date'])
                         else:
-                            date_str = datetime.now().strftime('%Y-%m-%d')
-                        
-                        # Create transaction with old method
-                        transaction = self.create_transaction(
-                            db=db,
-                            vendor=transaction_data.get('vendor', 'Unknown'),
-                            amount=float(transaction_data['amount']),
-                            date=date_str,
-                            category=transaction_data.get('category', 'Others'),
-                            sms_text=sms_text,
-                            confidence=float(transaction_data.get('confidence', 0.0)),
-                            user_id=user_id
-                        )
+                            date_str = (now or datetime.now()).strftime('%Y-%m-%d')
                         
                         return {
                             'success': True,
-                            'transaction': transaction,
+                            'row': {
+                                'vendor': transaction_data.get('vendor', 'Unknown'),
+                                'amount': float(transaction_data['amount']),
+                                'date': date_str,
+                                'category': transaction_data.get('category', 'Others'),
+                                'sms_text': sms_text,
+                                'confidence': float(transaction_data.get('confidence', 0.0)),
+                                'parsed_data': {},  # Stored as a plain debit, as before
+                                'user_id': user_id,
+                                'fingerprint': fingerprint,
+                                'device_received_at': device_datetime,
+                                'sender_address': sender
+                            },
                             'method': 'fallback_ollama'
                         }
                 
@@ -179,86 +385,24 @@ class TransactionController:
     ) -> Dict[str, Any]:
         """Fast local-only SMS parse with fingerprint deduplication; no LLM"""
         try:
-            # STEP 0: FAST fingerprint check BEFORE any processing
-            fingerprint = None
-            device_datetime = None
-            
-            if sender and device_timestamp:
-                fingerprint = self.deduplicator.generate_fingerprint(
-                    sender, sms_text, device_timestamp
-                )
-                
-                # Fast indexed DB query - O(log n), ~10ms vs 2-5s LLM
-                if self.deduplicator.is_duplicate_by_fingerprint(fingerprint, db):
-                    raise HTTPException(
-                        status_code=409, 
-                        detail="Duplicate SMS (fingerprint match)"
-                    )
-                
-                # Convert device timestamp to datetime
-                device_datetime = datetime.fromtimestamp(device_timestamp / 1000.0)
-            
-            # STEP 1: Parse SMS using regex
-            parsed = self.sms_parser.parse_transaction(sms_text)
-            if not parsed.get('success'):
-                raise HTTPException(status_code=400, detail=parsed.get('error', 'Failed to parse SMS'))
-            
-            vendor = parsed.get('vendor', 'Unknown')
-            amount = float(parsed.get('amount', 0) or 0)
-            category = parsed.get('category', 'Others')
-            confidence = float(parsed.get('confidence', 0.8))
-            transaction_type = parsed.get('transaction_type', 'debit')
-            
-            # STEP 2: Use device timestamp as fallback if no date in SMS
-            date_str = parsed.get('date')
-            if not date_str:
-                if device_datetime:
-                    date_str = device_datetime.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    date_str = datetime.now().strftime('%Y-%m-%d')
-            
-            # Legacy dedup check (fallback if no fingerprint)
-            if not fingerprint:
-                duplicate_check_data = {
-                    'vendor': vendor, 'amount': amount, 'date': date_str,
-                    'transaction_type': transaction_type, 'category': category,
-                    'sms_text': sms_text
-                }
-                
-                duplicate_result = self.deduplicator.is_duplicate(duplicate_check_data)
-                if duplicate_result['is_duplicate']:
-                    raise HTTPException(status_code=409, detail=f"Duplicate transaction: {duplicate_result['reason']}")
-                
-                # Check database for existing SMS text
-                from app.models.transaction import Transaction
-                existing = db.query(Transaction).filter(
-                    Transaction.sms_text == sms_text,
-                    Transaction.user_id == user_id
-                ).first()
-                if existing:
-                    raise HTTPException(status_code=409, detail="SMS already processed for this user")
+            now = datetime.now()  # Shared by the date fallback and timestamps
+            prepared = self.prepare_local_transaction(
+                db, sms_text, user_id=user_id, sender=sender, device_timestamp=device_timestamp, now=now
+            )
+            if not prepared['success']:
+                status_code = 409 if prepared['reason'] == 'duplicate' else 400
+                raise HTTPException(status_code=status_code, detail=prepared['error'])
+            row = prepared['row']
             
-            # STEP 3: Create transaction with fingerprint and temporal data
+            # Create transaction with fingerprint and temporal data
             transaction = self.create_enhanced_transaction(
-                db=db,
-                vendor=vendor,
-                amount=amount,
-                date=date_str,
-                category=category,
-                sms_text=sms_text,
-                confidence=confidence,
-                parsed_data=parsed,
-                user_id=user_id,
-                fingerprint=fingerprint,
-                device_received_at=device_datetime,
-                sender_address=sender
+                db=db, unique_sms_text=not row['fingerprint'], now=now, **row
             )
+            if transaction is None:
+                raise HTTPException(status_code=409, detail=self._duplicate_error(row))
             
             # Add to in-memory deduplicator
-            self.deduplicator.add_transaction({
-                'vendor': vendor, 'amount': amount, 'date': date_str,
-                'transaction_type': transaction_type, 'sms_text': sms_text
-            })
+            self._remember_transaction(row, now=now)
             
             return {
                 'success': True,
@@ -270,6 +414,321 @@ class TransactionController:
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Local quick parse failed: {str(e)}")
     
+    def prepare_local_transaction(
+        self,
+        db: Session,
+        sms_text: str,
+        user_id: Optional[int] = None,
+        sender: Optional[str] = None,
+        device_timestamp: Optional[int] = None,
+        preloaded: Optional[Dict[str, set]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Regex-parse and dedup one SMS without storing it
+        
+        Returns ``{'success': True, 'row': <create_enhanced_transaction kwargs>}``
+        or a parse_sms-style rejection (reason 'duplicate' or 'parse_failed'),
+        so a batch full of duplicates raises nothing per SMS.
+        `preloaded` is the result of TransactionDeduplicator.preload for a batch;
+        when given, DB duplicate checks become set lookups. `now` dates SMS
+        that carry no date of their own.
+        """
+        # STEP 0: FAST fingerprint check BEFORE any processing
+        fingerprint = None
+        device_datetime = None
+        
+        if sender and device_timestamp:
+            fingerprint = self.deduplicator.generate_fingerprint(
+                sender, sms_text, device_timestamp
+            )
+            
+            # A batch checks its preloaded set. A single SMS skips the SELECT:
+            # the regex parse is cheap and the INSERT's ON CONFLICT on the
+            # unique fingerprint reports the duplicate (409) anyway.
+            if preloaded is not None and fingerprint in preloaded['fingerprints']:
+                return self._rejected('duplicate', "Duplicate SMS (fingerprint match)")
+            
+            # Convert device timestamp to datetime
+            device_datetime = datetime.fromtimestamp(device_timestamp / 1000.0)
+        
+        # STEP 1: Parse SMS using regex
+        parsed = SMSParser.parse_transaction(sms_text)
+        if not parsed.get('success'):
+            return self._rejected('parse_failed', parsed.get('error', 'Failed to parse SMS'))
+        
+        vendor = parsed.get('vendor', 'Unknown')
+        amount = float(parsed.get('amount', 0) or 0)
+        category = parsed.get('category', 'Others')
+        confidence = float(parsed.get('confidence', 0.8))
+        transaction_type = parsed.get('transaction_type', 'debit')
+        
+        # STEP 2: Use device timestamp as fallback if no date in SMS
+        date_str = parsed.get('date')
+        if not date_str:
+            if device_datetime:
+                date_str = device_datetime.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                date_str = (now or datetime.now()).strftime('%Y-%m-%d')
+        
+        # Legacy dedup check (fallback if no fingerprint)
+        if not fingerprint:
+            duplicate_check_data = {
+                'vendor': vendor, 'amount': amount, 'date': date_str,
+                'transaction_type': transaction_type, 'category': category,
+                'sms_text': sms_text
+            }
+            
+            duplicate_result = self.deduplicator.is_duplicate(duplicate_check_data)
+            if duplicate_result['is_duplicate']:
+                return self._rejected('duplicate', f"Duplicate transaction: {duplicate_result['reason']}")
+            
+            # A batch checks its preloaded SMS texts; a single SMS is checked
+            # by the INSERT itself (unique_sms_text)
+            if preloaded is not None and sms_text in preloaded['sms_texts']:
+                return self._rejected('duplicate', "SMS already processed for this user")
+        
+        return {
+            'success': True,
+            'row': {
+                'vendor': vendor,
+                'amount': amount,
+                'date': date_str,
+                'category': category,
+                'sms_text': sms_text,
+                'confidence': confidence,
+                'parsed_data': parsed,
+                'user_id': user_id,
+                'fingerprint': fingerprint,
+                'device_received_at': device_datetime,
+                'sender_address': sender
+            }
+        }
+    
+    def _remember_transaction(self, row: Dict[str, Any], now: Optional[datetime] = None):
+        """Record a stored row in the in-memory deduplicator"""
+        self._remember_transactions([row], now=now)
+    
+    def _remember_transactions(self, rows: List[Dict[str, Any]], now: Optional[datetime] = None):
+        """Record stored rows in the in-memory deduplicator in one update"""
+        self.deduplicator.add_transactions_bulk([
+            {
+                'vendor': row['vendor'], 'amount': row['amount'], 'date': row['date'],
+                'transaction_type': row['parsed_data'].get('transaction_type', 'debit'),
+                'sms_text': row['sms_text']
+            }
+            for row in rows
+        ], now=now)
+    
+    def _preload_batch(self, db: Session, sms_items: List[Dict[str, Any]], user_id: Optional[int]) -> Dict[str, set]:
+        """Fetch the batch's already-stored fingerprints and SMS texts in one go"""
+        # One round-trip per key type for the whole batch instead of per SMS
+        return self.deduplicator.preload(
+            db,
+            user_id,
+            fingerprints=(
+                self.deduplicator.generate_fingerprint(m['sender'], m.get('sms_text') or '', m['device_timestamp'])
+                for m in sms_items if m.get('sender') and m.get('device_timestamp')
+            ),
+            sms_texts=(m.get('sms_text') for m in sms_items)
+        )
+    
+    def _store_batch(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        errors: List[str],
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Drop in-batch duplicates, then insert the remaining rows in one commit"""
+        unique_rows = []
+        seen = set()
+        for row in rows:
+            # Duplicates inside the batch itself aren't in the DB yet
+            key = row['fingerprint'] or row['sms_text']
+            if key in seen:
+                errors.append("Duplicate SMS within batch")
+                continue
+            seen.add(key)
+            unique_rows.append(row)
+        
+        # One clock read stamps the whole batch, in the DB and in dedup history
+        now = now or datetime.now()
+        transactions = self.create_transactions_bulk(db, unique_rows, now=now)
+        # Anything not inserted lost a race with a concurrent upload of the same SMS
+        errors.extend(["Duplicate SMS (fingerprint match)"] * (len(unique_rows) - len(transactions)))
+        self._remember_transactions(unique_rows, now=now)
+        return transactions
+    
+    def parse_sms_local_batch(
+        self,
+        db: Session,
+        sms_items: List[Dict[str, Any]],
+        user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Regex-parse many SMS and store all accepted rows in a single commit"""
+        preloaded = self._preload_batch(db, sms_items, user_id)
+        now = datetime.now()  # Shared by every row's date fallback and timestamps
+        
+        rows = []
+        errors = []
+        for sms_item in sms_items:
+            prepared = self.prepare_local_transaction(
+                db,
+                sms_item.get('sms_text') or '',
+                user_id=user_id,
+                sender=sms_item.get('sender'),
+                device_timestamp=sms_item.get('device_timestamp'),
+                preloaded=preloaded,
+                now=now
+            )
+            if prepared['success']:
+                rows.append(prepared['row'])
+            else:
+                errors.append(prepared['error'])
+        
+        return {
+            'success': True,
+            'transactions': self._store_batch(db, rows, errors, now=now),
+            'errors': errors,
+            'method': 'local_batch'
+        }
+    
+    async def parse_sms_batch(
+        self,
+        db: Session,
+        sms_items: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """LLM-parse many SMS concurrently and store all accepted rows in a single commit
+        
+        At most ``concurrency`` SMS (default OLLAMA_MAX_CONCURRENT_PARSES) are
+        with the LLM at once; duplicate lookups come from one preload, so
+        every SMS shares ``db``.
+        """
+        preloaded = self._preload_batch(db, sms_items, user_id)
+        now = datetime.now()  # Shared by every row's date fallback and timestamps
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.OLLAMA_MAX_CONCURRENT_PARSES))
+        
+        async def _prepare_one(sms_item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.prepare_llm_transaction(
+                        db,
+                        sms_item.get('sms_text') or '',
+                        user_id=user_id,
+                        sender=sms_item.get('sender'),
+                        device_timestamp=sms_item.get('device_timestamp'),
+                        preloaded=preloaded,
+                        now=now
+                    )
+                except HTTPException as e:
+                    return self._rejected('error', str(e.detail))
+        
+        rows = []
+        errors = []
+        for prepared in await asyncio.gather(*(_prepare_one(item) for item in sms_items)):
+            if prepared['success']:
+                rows.append(prepared['row'])
+            else:
+                errors.append(prepared['error'])
+        
+        return {
+            'success': True,
+            'transactions': self._store_batch(db, rows, errors, now=now),
+            'errors': errors,
+            'method': 'llm_batch'
+        }
+    
+    @staticmethod
+    def _transaction_values(
+        vendor: str,
+        amount: float,
+        date: str,
+        category: str,
+        sms_text: str,
+        confidence: float = 0.0,
+        parsed_data: Dict[str, Any] = None,
+        user_id: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+        device_received_at: Optional[datetime] = None,
+        sender_address: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Column values for an enhanced transaction row"""
+        parsed_data = parsed_data or {}
+        now = now or datetime.now()
+        return {
+            'vendor': vendor,
+            'amount': abs(amount),  # Always store as positive
+            'date': _parse_transaction_date(date, now),  # Store as DateTime object
+            'transaction_type': parsed_data.get('transaction_type', 'debit'),  # REQUIRED: 'debit' or 'credit'
+            'category': category,
+            'sms_text': sms_text,
+            'sms_digest': sms_digest(sms_text),
+            'confidence': confidence,
+            'created_at': now,
+            'user_id': user_id,  # User isolation
+            # NEW: Temporal-context aware fields
+            'fingerprint': fingerprint,  # MD5 hash for fast dedup
+            'device_received_at': device_received_at,  # When SMS arrived on device
+            'sender_address': sender_address,  # SMS sender ID
+            # Enhanced fields from classification
+            'payment_method': parsed_data.get('payment_method'),
+            'is_subscription': parsed_data.get('is_subscription', False),
+            'subscription_service': parsed_data.get('subscription_service'),
+            'card_last_four': parsed_data.get('card_last_four'),
+            'upi_transaction_id': parsed_data.get('upi_transaction_id'),
+            'merchant_category': parsed_data.get('merchant_category'),
+            'is_recurring': parsed_data.get('is_recurring', False)
+        }
+    
+    @staticmethod
+    def _insert_stmt(db: Session):
+        """INSERT that skips rows whose fingerprint is already stored.
+        
+        The unique fingerprint index makes the DB the final dedup authority, so
+        two concurrent parses of the same SMS store it once instead of one of
+        them failing with an IntegrityError.
+        """
+        dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is None:
+            return insert(Transaction)
+        return dialect_insert(Transaction).on_conflict_do_nothing(index_elements=['fingerprint'])
+    
+    @classmethod
+    def _insert_returning(
+        cls,
+        db: Session,
+        values: Dict[str, Any],
+        unique_sms_text: bool = False
+    ) -> Optional[Row]:
+        """INSERT one row and get its response columns from RETURNING in the
+        same round-trip; None when the fingerprint was already stored.
+        
+        With ``unique_sms_text`` the row is inserted through
+        ``INSERT ... SELECT ... WHERE NOT EXISTS``, so the "SMS already stored
+        for this user" check runs in the same statement (and returns None too).
+        
+        A plain Row is not expired by the commit and carries only what the
+        parse/create responses serialize, so no ORM object is built or reloaded.
+        """
+        stmt = cls._insert_stmt(db)
+        if unique_sms_text:
+            columns = Transaction.__table__.c
+            stmt = stmt.from_select(
+                list(values),
+                select(*(literal(value, columns[name].type) for name, value in values.items())).where(
+                    ~exists().where(
+                        Transaction.user_id == values['user_id'],
+                        Transaction.sms_digest == values['sms_digest']
+                    )
+                )
+            )
+        else:
+            stmt = stmt.values(**values)
+        return db.execute(stmt.returning(*_LISTING_COLUMNS)).one_or_none()
+    
     def create_enhanced_transaction(
         self,
         db: Session,
@@ -283,70 +742,83 @@ class TransactionController:
         user_id: Optional[int] = None,
         fingerprint: Optional[str] = None,
         device_received_at: Optional[datetime] = None,
-        sender_address: Optional[str] = None
-    ) -> Transaction:
-        """Create a new transaction with enhanced classification and temporal data"""
+        sender_address: Optional[str] = None,
+        unique_sms_text: bool = False,
+        now: Optional[datetime] = None
+    ) -> Optional[Row]:
+        """Create a new transaction with enhanced classification and temporal data
+        
+        Returns the new row's response columns, or None if a transaction with
+        the same fingerprint - or, with ``unique_sms_text``, the same user and
+        SMS text - already exists. ``now`` stamps the row (default: the clock).
+        """
         try:
-            # Parse date string to datetime with flexible format handling
-            if isinstance(date, str):
-                try:
-                    # Try ISO format first (from mobile app)
-                    if 'T' in date:
-                        # Remove microseconds if present
-                        date_clean = date.split('.')[0] if '.' in date else date
-                        transaction_date = datetime.fromisoformat(date_clean.replace('T', ' '))
-                    else:
-                        # Try standard date format
-                        transaction_date = datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    # Fallback to current date if parsing fails
-                    transaction_date = datetime.now()
-            else:
-                transaction_date = date if isinstance(date, datetime) else datetime.now()
-            
-            # Validate date - if it's in the future, adjust it to current year
-            current_year = datetime.now().year
-            if transaction_date.year > current_year:
-                # If year is 2026 or later, assume it should be current year
-                transaction_date = transaction_date.replace(year=current_year)
-            
-            # Get transaction type from parsed_data or default to 'debit'
-            transaction_type = parsed_data.get('transaction_type', 'debit') if parsed_data else 'debit'
-            
-            # Create transaction with enhanced fields and temporal data
-            transaction = Transaction(
+            transaction = self._insert_returning(db, self._transaction_values(
                 vendor=vendor,
-                amount=abs(amount),  # Always store as positive
-                date=transaction_date,  # Store as DateTime object
-                transaction_type=transaction_type,  # REQUIRED: 'debit' or 'credit'
+                amount=amount,
+                date=date,
                 category=category,
                 sms_text=sms_text,
                 confidence=confidence,
-                created_at=datetime.now(),
-                user_id=user_id,  # User isolation
-                # NEW: Temporal-context aware fields
-                fingerprint=fingerprint,  # MD5 hash for fast dedup
-                device_received_at=device_received_at,  # When SMS arrived on device
-                sender_address=sender_address,  # SMS sender ID
-                # Enhanced fields from classification
-                payment_method=parsed_data.get('payment_method') if parsed_data else None,
-                is_subscription=parsed_data.get('is_subscription', False) if parsed_data else False,
-                subscription_service=parsed_data.get('subscription_service') if parsed_data else None,
-                card_last_four=parsed_data.get('card_last_four') if parsed_data else None,
-                upi_transaction_id=parsed_data.get('upi_transaction_id') if parsed_data else None,
-                merchant_category=parsed_data.get('merchant_category') if parsed_data else None,
-                is_recurring=parsed_data.get('is_recurring', False) if parsed_data else False
-            )
-            
-            db.add(transaction)
+                parsed_data=parsed_data,
+                user_id=user_id,
+                fingerprint=fingerprint,
+                device_received_at=device_received_at,
+                sender_address=sender_address,
+                now=now
+            ), unique_sms_text=unique_sms_text)
+            if transaction is None:
+                # Already stored; nothing was written
+                db.rollback()
+                return None
             db.commit()
-            db.refresh(transaction)
             return transaction
             
         except Exception as e:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to create enhanced transaction: {str(e)}")
     
+    def create_transactions_bulk(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Insert many transactions (create_enhanced_transaction kwargs) in one commit.
+        
+        Returns the stored column values of each inserted row, with its new 'id',
+        in input order. Rows whose fingerprint is already stored are skipped.
+        ``now`` stamps every row; by default the clock is read once here.
+        """
+        if not rows:
+            return []
+        try:
+            now = now or datetime.now()  # One clock read for the whole batch
+            values = [self._transaction_values(**row, now=now) for row in rows]
+            # SQLAlchemy 2.x "insertmanyvalues": batched INSERT ... VALUES (...), (...) RETURNING id.
+            # Plain dicts are returned so nothing has to be reloaded after the commit expires it.
+            returned = db.execute(
+                self._insert_stmt(db).returning(
+                    Transaction.id, Transaction.fingerprint, sort_by_parameter_order=True
+                ),
+                values
+            ).all()
+            db.commit()
+            # Skipped rows are missing from RETURNING; the rest arrive in input
+            # order, so walk both lists together matching on fingerprint
+            inserted = []
+            returned = iter(returned)
+            current = next(returned, None)
+            for row_values in values:
+                if current is not None and current.fingerprint == row_values['fingerprint']:
+                    row_values['id'] = current.id
+                    inserted.append(row_values)
+                    current = next(returned, None)
+            return inserted
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to create transactions: {str(e)}")
+    
     def create_transaction(
         self,
         db: Session,
@@ -357,59 +829,59 @@ class TransactionController:
         sms_text: str,
         confidence: float = 0.0,
         user_id: Optional[int] = None
-    ) -> Transaction:
-        """Create a new transaction"""
-        try:
-            # Parse date string to datetime with flexible format handling
-            if isinstance(date, str):
-                try:
-                    # Try ISO format first (from mobile app)
-                    if 'T' in date:
-                        # Remove microseconds if present
-                        date_clean = date.split('.')[0] if '.' in date else date
-                        transaction_date = datetime.fromisoformat(date_clean.replace('T', ' '))
-                    else:
-                        # Try standard date format
-                        transaction_date = datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    # Fallback to current date if parsing fails
-                    transaction_date = datetime.now()
-            else:
-                transaction_date = date if isinstance(date, datetime) else datetime.now()
-            
-            # Validate date - if it's in the future, adjust it to current year
-            current_year = datetime.now().year
-            if transaction_date.year > current_year:
-                # If year is 2026 or later, assume it should be current year
-                transaction_date = transaction_date.replace(year=current_year)
-            
-            transaction = Transaction(
-                vendor=vendor,
-                amount=abs(amount),  # Always store as positive
-                date=transaction_date,  # Store as DateTime object
-                transaction_type='debit',  # Default to debit for simple creation
-                category=category,
-                sms_text=sms_text,
-                confidence=confidence,
-                created_at=datetime.now(),
-                user_id=user_id
-            )
-            
-            db.add(transaction)
-            db.commit()
-            db.refresh(transaction)
-            return transaction
-            
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"Failed to create transaction: {str(e)}")
+    ) -> Row:
+        """Create a new transaction; returns its response columns
+        
+        A plain debit with no SMS metadata - the subset of
+        create_enhanced_transaction a manual entry needs.
+        """
+        return self.create_enhanced_transaction(
+            db=db,
+            vendor=vendor,
+            amount=amount,
+            date=date,
+            category=category,
+            sms_text=sms_text,
+            confidence=confidence,
+            user_id=user_id
+        )
     
-    def get_user_transactions(self, db: Session, user_id: int, limit: Optional[int] = None) -> List[Transaction]:
-        """Get transactions for a specific user"""
+    def get_user_transactions(
+        self,
+        db: Session,
+        user_id: int,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> List[Transaction]:
+        """Get transactions for a specific user, newest first
+        
+        Pass the (date, id) of the previous page's last transaction as
+        ``before`` to seek to the next page along idx_user_date.
+        """
         query = db.query(Transaction).filter(Transaction.user_id == user_id)
+        if before is not None:
+            query = query.filter(tuple_(Transaction.date, Transaction.id) < before)
+        # id breaks ties between same-date rows so pages never overlap
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
         if limit:
             query = query.limit(limit)
-        return query.order_by(Transaction.date.desc()).all()
+        return query.all()
+    
+    def iter_transactions(
+        self,
+        db: Session,
+        *criteria,
+        columns: Tuple = _LISTING_COLUMNS,
+        chunk: int = 1000
+    ) -> Iterator[Row]:
+        """Stream transaction rows matching ``criteria`` in id order
+        
+        Rows are fetched ``chunk`` at a time as plain Core rows, so exports
+        and whole-table analytics hold one chunk in memory rather than an
+        ORM object per transaction.
+        """
+        stmt = select(*columns).where(*criteria).order_by(Transaction.id)
+        yield from db.execute(stmt.execution_options(yield_per=chunk))
     
     def get_user_transaction_count(self, db: Session, user_id: int) -> int:
         """Get transaction count for a specific user"""
@@ -420,16 +892,23 @@ class TransactionController:
         db: Session,
         user_id: Optional[int] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[Transaction]:
-        """Get transactions with optional user filtering"""
-        query = db.query(Transaction)
+        offset: int = 0,
+        before_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get transactions with optional user filtering, as listing rows
+        
+        Pass the last id of the previous page as ``before_id`` to seek to the
+        next page; unlike ``offset`` it costs the same at any depth.
+        """
+        stmt = select(*_LISTING_COLUMNS)
         
         # Enable user filtering for proper isolation
         if user_id is not None:
-            query = query.filter(Transaction.user_id == user_id)
+            stmt = stmt.where(Transaction.user_id == user_id)
+        if before_id is not None:
+            stmt = stmt.where(Transaction.id < before_id)
         
-        return query.order_by(Transaction.id.desc()).offset(offset).limit(limit).all()
+        return db.execute(stmt.order_by(Transaction.id.desc()).offset(offset).limit(limit)).all()
     
     def get_transaction_by_id(self, db: Session, transaction_id: int, user_id: Optional[int] = None) -> Transaction:
         """Get transaction by ID"""
@@ -451,22 +930,40 @@ class TransactionController:
         transaction_id: int,
         user_id: Optional[int] = None,
         **kwargs
-    ) -> Transaction:
-        """Update transaction"""
-        transaction = self.get_transaction_by_id(db, transaction_id, user_id)
+    ) -> Row:
+        """Update transaction in a single UPDATE ... RETURNING its response columns"""
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in _UPDATABLE_COLUMNS and value is not None
+        }
+        if not values:
+            return self.get_transaction_by_id(db, transaction_id, user_id)
+        if 'sms_text' in values:
+            values['sms_digest'] = sms_digest(values['sms_text'])
         
-        for key, value in kwargs.items():
-            if hasattr(transaction, key) and value is not None:
-                setattr(transaction, key, value)
+        stmt = update(Transaction).where(Transaction.id == transaction_id)
+        # Enable user filtering for proper isolation
+        if user_id is not None:
+            stmt = stmt.where(Transaction.user_id == user_id)
+        
+        transaction = db.execute(stmt.values(**values).returning(*_LISTING_COLUMNS)).one_or_none()
+        if transaction is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Transaction not found")
         
         db.commit()
-        db.refresh(transaction)
         return transaction
     
     def delete_transaction(self, db: Session, transaction_id: int, user_id: Optional[int] = None):
-        """Delete transaction"""
-        transaction = self.get_transaction_by_id(db, transaction_id, user_id)
-        db.delete(transaction)
+        """Delete transaction in a single DELETE ... RETURNING"""
+        stmt = delete(Transaction).where(Transaction.id == transaction_id)
+        # Enable user filtering for proper isolation
+        if user_id is not None:
+            stmt = stmt.where(Transaction.user_id == user_id)
+        
+        if db.scalar(stmt.returning(Transaction.id)) is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Transaction not found")
         db.commit()
         return {"message": "Transaction deleted successfully"}
     
@@ -476,26 +973,44 @@ class TransactionController:
         query: str,
         user_id: Optional[int] = None,
         limit: int = 50
-    ) -> List[Transaction]:
-        """Search transactions by vendor or category"""
-        from sqlalchemy import or_
+    ) -> List[Row]:
+        """Search transactions by vendor or category, as listing rows
         
-        search_query = db.query(Transaction).filter(
-            or_(
-                Transaction.vendor.ilike(f"%{query}%"),
-                Transaction.category.ilike(f"%{query}%")
+        On SQLite the substring match runs against the FTS5 trigram index
+        instead of scanning every row; shorter queries, which trigrams can't
+        match, and other databases use ILIKE.
+        """
+        if len(query) >= _SEARCH_INDEX_MIN_CHARS and db.get_bind().dialect.name == 'sqlite':
+            # Quoted as one FTS string so operators and punctuation match literally
+            phrase = '"' + query.replace('"', '""') + '"'
+            matched = select(_SEARCH_INDEX.c.rowid).where(
+                text(f"{SEARCH_INDEX_TABLE} MATCH :phrase").bindparams(phrase=phrase)
+            )
+            stmt = select(*_LISTING_COLUMNS).where(Transaction.id.in_(matched))
+        else:
+            stmt = select(*_LISTING_COLUMNS).where(
+                or_(
+                    Transaction.vendor.ilike(f"%{query}%"),
+                    Transaction.category.ilike(f"%{query}%")
+                )
             )
-        )
         
         # Enable user filtering for proper isolation
         if user_id is not None:
-            search_query = search_query.filter(Transaction.user_id == user_id)
+            stmt = stmt.where(Transaction.user_id == user_id)
         
-        return search_query.order_by(Transaction.date.desc()).limit(limit).all()
+        return db.execute(stmt.order_by(Transaction.date.desc()).limit(limit)).all()
     
     def get_categories(self, db: Session) -> List[Category]:
-        """Get all categories"""
-        return db.query(Category).all()
+        """Get all categories (cached for five minutes or until create_category)"""
+        categories = self._categories_cache.get('all')
+        if categories is None:
+            categories = db.query(Category).all()
+            # Detach so the cached rows outlive this session without reloads
+            for category in categories:
+                db.expunge(category)
+            categories = self._categories_cache['all'] = tuple(categories)
+        return list(categories)
     
     def create_category(self, db: Session, name: str, description: str = None, color: str = None, icon: str = None) -> Category:
         """Create new category"""
@@ -507,6 +1022,10 @@ class TransactionController:
         )
         
         db.add(category)
-        db.commit()
-        db.refresh(category)
+        commit_keeping_loaded(db, category)
+        self._categories_cache.clear()
         return category
+
+
+# Shared instance - routes must see one SMS parse cache and one dedup history
+transaction_controller = TransactionController()
@@ -2,27 +2,42 @@
 AI Financial Co-Pilot API - Modular Backend
 Main FastAPI application with authentication and modular architecture
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config.settings import settings
 from app.config.database import engine, Base
+from app.utils.ollama_client import close_ollama_client
 from app.routes import auth_routes, transaction_routes, analytics_routes, chatbot_routes, quick_routes, enhanced_chatbot_routes, predictions_routes, categorize_routes, monthly_routes
 from app.models import user, transaction
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# create_all skips indexes on tables that already exist; add any new ones
+for _table in Base.metadata.sorted_tables:
+    for _index in _table.indexes:
+        _index.create(bind=engine, checkfirst=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    yield
+    # Release pooled connections to Ollama
+    await close_ollama_client()
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     description=settings.APP_DESCRIPTION,
-    version=settings.APP_VERSION
+    version=settings.APP_VERSION,
+    lifespan=lifespan
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ALLOWED_ORIGINS,
+    allow_origins=["*"] if settings.CORS_ALLOW_ALL else sorted(settings.CORS_ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -39,24 +54,28 @@ app.include_router(predictions_routes.router)
 app.include_router(categorize_routes.router)
 app.include_router(monthly_routes.router)
 
+# Health responses never change while the process runs; serialize them once
+_ROOT_BODY = orjson.dumps({
+    "message": f"Welcome to {settings.APP_NAME}",
+    "version": settings.APP_VERSION,
+    "status": "healthy"
+})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "message": "All systems operational",
+    "app": settings.APP_NAME,
+    "version": settings.APP_VERSION
+})
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "status": "healthy"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
-    return {
-        "status": "healthy",
-        "message": "All systems operational",
-        "app": settings.APP_NAME,
-        "version": settings.APP_VERSION
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
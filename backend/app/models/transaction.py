@@ -1,8 +1,9 @@
 """Transaction model"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index, DDL, event, inspect, select, update, bindparam
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.config.database import Base
+from app.utils.transaction_deduplicator import sms_digest
 
 class Transaction(Base):
     __tablename__ = "transactions"
@@ -22,6 +23,7 @@ class Transaction(Base):
     fingerprint = Column(String(64), unique=True, index=True, nullable=True)  # MD5 hash for fast dedup
     device_received_at = Column(DateTime, nullable=True)  # When SMS was received on device
     sender_address = Column(String(100), nullable=True)  # SMS sender (bank ID)
+    sms_digest = Column(String(32), nullable=True)  # blake2b of sms_text for the per-user "already processed" check
     
     # Enhanced transaction classification fields
     payment_method = Column(String(50), nullable=True)  # 'UPI', 'Credit Card', 'Debit Card', 'Net Banking', etc.
@@ -32,9 +34,33 @@ class Transaction(Base):
     merchant_category = Column(String(100), nullable=True)  # Detailed merchant category
     is_recurring = Column(Boolean, nullable=True, default=False)  # Whether this is a recurring payment
     
-    # Composite index for fingerprint lookup
+    # Composite indexes for per-user lookups and GROUP BY aggregates
     __table_args__ = (
-        Index('idx_fingerprint_user', 'fingerprint', 'user_id'),
+        # amount makes it covering for the per-category spending aggregates:
+        # SUM/AVG/MIN/MAX are answered from the index without row lookups
+        Index('idx_user_type_category', 'user_id', 'transaction_type', 'category', 'amount'),
+        # Per-user date-ordered listing/search walks this index instead of sorting
+        Index('idx_user_date', 'user_id', 'date'),
+        # Serves ORDER BY id within one user
+        Index('ix_transactions_user_id', 'user_id'),
+        # SQLite entries above already end in the rowid (id); Postgres needs
+        # it spelled out for id/(date, id) keyset pages to be index seeks
+        Index('idx_user_id_id', 'user_id', 'id').ddl_if(dialect='postgresql'),
+        Index('idx_user_date_id', 'user_id', 'date', 'id').ddl_if(dialect='postgresql'),
+        # Unfiltered search orders by date
+        Index('ix_transactions_date', 'date'),
+        # "SMS already processed for this user" check and batch preload for
+        # SMS without a fingerprint, on a fixed-size digest rather than the body
+        Index('idx_user_sms_digest', 'user_id', 'sms_digest'),
+        # Trigram GIN indexes make ILIKE '%q%' index-backed (Postgres only)
+        Index(
+            'ix_transactions_vendor_trgm', 'vendor',
+            postgresql_using='gin', postgresql_ops={'vendor': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_transactions_category_trgm', 'category',
+            postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
     )
     
     # Relationship disabled for backward compatibility
@@ -43,6 +69,89 @@ class Transaction(Base):
     def __repr__(self):
         return f"<Transaction(id={self.id}, vendor={self.vendor}, amount={self.amount})>"
 
+# gin_trgm_ops comes from pg_trgm, which must exist before the indexes above
+event.listen(
+    Base.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+# Indexes earlier schemas created that nothing needs any more: the unique
+# fingerprint index already serves fingerprint lookups, and SMS bodies are
+# now matched through idx_user_sms_digest
+_OBSOLETE_INDEXES = ('idx_fingerprint_user', 'idx_user_sms_text')
+_DIGEST_BACKFILL_CHUNK = 1000
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _upgrade_transactions(target, connection, **kw):
+    """Bring a database created by an older schema up to date
+
+    create_all never alters existing tables, so add sms_digest (and fill it
+    for stored rows, once) here and drop indexes the model no longer has.
+    """
+    for name in _OBSOLETE_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    columns = {c['name'] for c in inspect(connection).get_columns(Transaction.__tablename__)}
+    if 'sms_digest' in columns:
+        return
+    connection.exec_driver_sql(f"ALTER TABLE {Transaction.__tablename__} ADD COLUMN sms_digest VARCHAR(32)")
+    table = Transaction.__table__
+    fill = update(table).where(table.c.id == bindparam('row_id')).values(sms_digest=bindparam('digest'))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(table.c.id, table.c.sms_text)
+            .where(table.c.id > last_id, table.c.sms_text.isnot(None))
+            .order_by(table.c.id)
+            .limit(_DIGEST_BACKFILL_CHUNK)
+        ).all()
+        if not rows:
+            break
+        connection.execute(fill, [{'row_id': row.id, 'digest': sms_digest(row.sms_text)} for row in rows])
+        last_id = rows[-1].id
+
+
+# SQLite counterpart of the trigram indexes: an external-content FTS5 table
+# over vendor/category, kept in sync by triggers. The trigram tokenizer makes
+# MATCH a case-insensitive substring search, like ILIKE '%q%'.
+SEARCH_INDEX_TABLE = 'transactions_fts'
+_SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5("
+    "vendor, category, content='transactions', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    f"INSERT INTO {SEARCH_INDEX_TABLE}(rowid, vendor, category) VALUES (new.id, new.vendor, new.category); END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    f"INSERT INTO {SEARCH_INDEX_TABLE}({SEARCH_INDEX_TABLE}, rowid, vendor, category) "
+    "VALUES ('delete', old.id, old.vendor, old.category); END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF vendor, category ON transactions BEGIN "
+    f"INSERT INTO {SEARCH_INDEX_TABLE}({SEARCH_INDEX_TABLE}, rowid, vendor, category) "
+    "VALUES ('delete', old.id, old.vendor, old.category); "
+    f"INSERT INTO {SEARCH_INDEX_TABLE}(rowid, vendor, category) VALUES (new.id, new.vendor, new.category); END",
+)
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_search_index(target, connection, **kw):
+    """Create the FTS table and triggers; index existing rows the first time"""
+    if connection.dialect.name != 'sqlite':
+        return
+    existed = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (SEARCH_INDEX_TABLE,)
+    ).first()
+    for statement in _SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    if not existed:
+        connection.exec_driver_sql(
+            f"INSERT INTO {SEARCH_INDEX_TABLE}({SEARCH_INDEX_TABLE}) VALUES ('rebuild')"
+        )
+
+
+@event.listens_for(Base.metadata, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    # Left behind, it would point at rowids of a recreated transactions table
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}")
+
 class Category(Base):
     __tablename__ = "categories"
     
@@ -1,15 +1,16 @@
 """Analytics routes"""
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import case, distinct, func, extract
 from typing import Dict, Any, List
 from app.config.database import get_db
 from app.models.transaction import Transaction
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
+from app.utils.json_response import OrjsonResponse
 from datetime import datetime, timedelta
 
-router = APIRouter(prefix="/v1/analytics", tags=["analytics"])
+router = APIRouter(prefix="/v1/analytics", tags=["analytics"], default_response_class=OrjsonResponse)
 
 @router.get("/insights")
 async def get_insights(
@@ -17,10 +18,23 @@ async def get_insights(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get financial insights for user"""
-    # Get user's transactions
-    transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-    
-    if not transactions:
+    # One aggregate pass in the database instead of loading every
+    # transaction of the user as an ORM object
+    is_debit = Transaction.transaction_type == 'debit'
+    totals = db.query(
+        func.count().label('total_transactions'),
+        func.sum(case((is_debit, Transaction.amount))).label('total_spending'),
+        func.sum(case((Transaction.transaction_type == 'credit', Transaction.amount))).label('total_income'),
+        func.count(case((is_debit, 1))).label('spending_count'),
+        func.max(case((is_debit, Transaction.amount))).label('max_spending'),
+        func.min(case((is_debit, Transaction.amount))).label('min_spending'),
+        # A missing vendor counts as one more distinct vendor, as set() did
+        (func.count(distinct(Transaction.vendor))
+         + func.max(case((Transaction.vendor.is_(None), 1), else_=0))).label('unique_vendors'),
+        func.count(distinct(func.date(Transaction.date))).label('active_days')
+    ).filter(Transaction.user_id == current_user.id).one()
+    
+    if not totals.total_transactions:
         return {
             "success": True,
             "total_transactions": 0,
@@ -31,19 +45,18 @@ async def get_insights(
         }
     
     # Calculate metrics using transaction_type
-    total_transactions = len(transactions)
-    total_spending = sum(t.amount for t in transactions if t.transaction_type == 'debit')
-    total_income = sum(t.amount for t in transactions if t.transaction_type == 'credit')
+    total_transactions = totals.total_transactions
+    total_spending = totals.total_spending or 0
+    total_income = totals.total_income or 0
     net_balance = total_income - total_spending
     
-    spending_transactions = [t for t in transactions if t.transaction_type == 'debit']
-    avg_transaction = total_spending / len(spending_transactions) if spending_transactions else 0
-    max_spending = max((t.amount for t in spending_transactions), default=0)
-    min_spending = min((t.amount for t in spending_transactions), default=0)
+    avg_transaction = total_spending / totals.spending_count if totals.spending_count else 0
+    max_spending = totals.max_spending or 0
+    min_spending = totals.min_spending or 0
     
     # Get unique vendors and active days
-    unique_vendors = len(set(t.vendor for t in transactions))
-    unique_dates = len(set(t.date.date() if t.date else None for t in transactions if t.date))
+    unique_vendors = totals.unique_vendors
+    unique_dates = totals.active_days
     
     # Generate insights
     insights = []
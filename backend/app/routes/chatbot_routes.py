@@ -9,7 +9,6 @@ from pydantic import BaseModel
 
 from app.controllers import chatbot_controller
 from app.config.database import get_db
-from app.models.transaction import Transaction
 
 router = APIRouter(prefix="/v1/chatbot", tags=["Financial Chatbot"])
 
@@ -37,23 +36,22 @@ async def query_chatbot(
     try:
         print(f"🤖 Chatbot query received: {request.query}")
         
-        # Fetch transactions from database (using public endpoint approach)
-        transactions = db.query(Transaction).order_by(Transaction.date.desc()).limit(request.limit).all()
+        # Aggregate over the most recent transactions in the database
+        # (limit to 30 most recent for faster processing, as before)
+        window = min(request.limit, 30) if request.limit else 30
+        response_data = await chatbot_controller.get_chatbot_response(
+            request.query, db, limit=window
+        )
         
-        print(f"📊 Found {len(transactions)} transactions")
+        print(f"📊 Analyzed {response_data['transaction_count']} transactions")
         
-        if not transactions:
+        if not response_data["transaction_count"]:
             return ChatbotResponse(
                 response="I don't see any transactions in your account yet. Once you start adding transactions, I'll be able to help you analyze your spending patterns and provide financial insights!",
                 transaction_count=0,
                 query=request.query
             )
         
-        # Get the chatbot's response (limit transactions for faster processing)
-        limited_transactions = transactions[:30]  # Limit to 30 most recent transactions
-        print(f"🤖 Processing query with {len(limited_transactions)} transactions")
-        response_data = await chatbot_controller.get_chatbot_response(request.query, limited_transactions)
-        
         print(f"✅ Chatbot response generated successfully")
         return ChatbotResponse(**response_data)
         
@@ -72,10 +70,8 @@ async def get_financial_summary(
     Get a financial summary for the chatbot context.
     """
     try:
-        # Get recent transactions
-        transactions = db.query(Transaction).order_by(Transaction.date.desc()).limit(days * 5).all()  # Approximate
-        
-        summary = await chatbot_controller.get_spending_summary(transactions)
+        # Summarise recent transactions
+        summary = await chatbot_controller.get_spending_summary(db, limit=days * 5)  # Approximate
         
         return {
             "summary": summary,
@@ -95,22 +91,18 @@ async def get_quick_insights(
     Get quick financial insights without a specific query.
     """
     try:
-        # Get recent transactions
-        transactions = db.query(Transaction).order_by(Transaction.date.desc()).limit(50).all()
+        # Generate automatic insights with a simpler, faster query
+        insights_query = "Give me 3 quick insights about my spending in 2-3 sentences each."
+        
+        # Limit transactions for faster processing
+        response_data = await chatbot_controller.get_chatbot_response(insights_query, db, limit=20)  # Only use last 20 transactions
         
-        if not transactions:
+        if not response_data["transaction_count"]:
             return {
                 "insights": ["No transactions found. Start adding transactions to get personalized insights!"],
                 "transaction_count": 0
             }
         
-        # Generate automatic insights with a simpler, faster query
-        insights_query = "Give me 3 quick insights about my spending in 2-3 sentences each."
-        
-        # Limit transactions for faster processing
-        limited_transactions = transactions[:20]  # Only use last 20 transactions
-        response_data = await chatbot_controller.get_chatbot_response(insights_query, limited_transactions)
-        
         return {
             "insights": response_data["response"],
             "transaction_count": response_data["transaction_count"],
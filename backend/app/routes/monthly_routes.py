@@ -6,9 +6,10 @@ from app.config.database import get_db
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
 from app.utils.spending_analytics import SpendingAnalytics
+from app.utils.json_response import OrjsonResponse
 from datetime import datetime
 
-router = APIRouter(prefix="/v1/analytics", tags=["monthly-analytics"])
+router = APIRouter(prefix="/v1/analytics", tags=["monthly-analytics"], default_response_class=OrjsonResponse)
 
 
 @router.get("/monthly/summary")
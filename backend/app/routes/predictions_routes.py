@@ -2,10 +2,12 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field, conint, confloat
 from datetime import datetime
+from itertools import chain
 from sqlalchemy.orm import Session
-from predictive_analytics import PredictiveAnalytics
+from predictive_analytics import predictive_engine
 from app.config.database import get_db
 from app.models.transaction import Transaction
+from app.controllers.transaction_controller import transaction_controller
 
 router = APIRouter(prefix="/v1/predictions", tags=["predictions"])
 
@@ -28,8 +30,7 @@ class SavingsGoalResponse(BaseModel):
 async def create_savings_goal(req: SavingsGoalRequest):
     """Compute a savings plan suggestion. Public, stateless."""
     try:
-        engine = PredictiveAnalytics()
-        goal = engine.create_savings_goal(
+        goal = predictive_engine.create_savings_goal(
             target_amount=req.target_amount,
             target_months=req.target_months,
             current_income=req.current_income,
@@ -56,13 +57,17 @@ class TrainModelsResponse(BaseModel):
 async def train_models(db: Session = Depends(get_db)):
     """Train per-category spending models from existing transactions (debits only)."""
     try:
-        # Pull recent transactions (limit to last 6 months for speed)
-        from datetime import timedelta
-        cutoff = datetime.now() - timedelta(days=180)
-        txs = db.query(Transaction).filter(Transaction.date.isnot(None)).all()
-        # Fallback to created_at when date is None
-        if not txs:
-            txs = db.query(Transaction).all()
+        # Pull recent transactions (limit to last 6 months for speed);
+        # rows are streamed in chunks rather than loaded as ORM objects
+        columns = (Transaction.category, Transaction.amount, Transaction.date,
+                   Transaction.created_at, Transaction.transaction_type)
+        txs = transaction_controller.iter_transactions(db, Transaction.date.isnot(None), columns=columns)
+        # Fallback to created_at when no transaction has a date
+        first = next(txs, None)
+        if first is None:
+            txs = transaction_controller.iter_transactions(db, columns=columns)
+        else:
+            txs = chain((first,), txs)
 
         data = []
         for t in txs:
@@ -78,8 +83,7 @@ async def train_models(db: Session = Depends(get_db)):
                 'transaction_type': (t.transaction_type or 'debit')
             })
 
-        engine = PredictiveAnalytics()
-        scores = engine.train_spending_models(data)
+        scores = predictive_engine.train_spending_models(data)
         cats = sorted(list(scores.keys()))
         return TrainModelsResponse(
             categories_trained=cats,
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, BackgroundTasks
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.config.database import get_db, SessionLocal
-from app.controllers.transaction_controller import TransactionController
+from app.controllers.transaction_controller import transaction_controller
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
 import asyncio
@@ -49,12 +49,13 @@ class JobStatusResponse(BaseModel):
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-transaction_controller = TransactionController()
-
 async def process_sms_async(job_id: str, sms_text: str, user_id: Optional[int]):
     db_session = SessionLocal()
     try:
         result = await transaction_controller.parse_sms(db_session, sms_text, user_id=user_id)
+        if not result['success']:
+            processing_results[job_id] = {"status": "failed", "error": result['error']}
+            return
         processing_results[job_id] = {
             "status": "completed",
             "result": {
@@ -131,58 +132,30 @@ async def process_sms_batch_async(job_id: str, sms_items: List[Dict[str, Any]],
     failed = 0
     items: List[Dict[str, Any]] = []
 
-    # Helper: process a single SMS with its own DB session
-    async def _process_one(sms_item: Dict[str, Any]) -> Dict[str, Any]:
-        db = SessionLocal()
-        try:
-            # Extract metadata if available
-            sms_text = sms_item.get('sms_text') or sms_item.get('text') or str(sms_item)
-            sender = sms_item.get('sender')
-            device_timestamp = sms_item.get('device_timestamp')
-            
-            # Pass metadata to controller for fingerprint dedup
-            result = await transaction_controller.parse_sms(
-                db, 
-                sms_text, 
-                user_id=user_id,
-                sender=sender,
-                device_timestamp=device_timestamp
-            )
-            t = result['transaction']
-            return {
-                "ok": True,
-                "transaction_id": t.id,
-                "vendor": t.vendor,
-                "amount": t.amount,
-                "category": t.category,
-            }
-        except Exception as e:
-            return {"ok": False, "error": str(e)}
-        finally:
-            db.close()
-
     try:
         n = len(sms_items)
         i = 0
         while i < n:
             chunk = sms_items[i:i + max(1, batch_size)]
-            # Process this chunk concurrently
-            results = await asyncio.gather(*[_process_one(item) for item in chunk], return_exceptions=False)
+            # Parse this chunk concurrently and store it in one commit
+            db_session = SessionLocal()
+            try:
+                result = await transaction_controller.parse_sms_batch(db_session, chunk, user_id=user_id)
+            finally:
+                db_session.close()
 
-            for r in results:
-                if r.get("ok"):
-                    success += 1
-                    items.append({
-                        "success": True,
-                        "transaction_id": r.get("transaction_id"),
-                        "vendor": r.get("vendor"),
-                        "amount": r.get("amount"),
-                        "category": r.get("category"),
-                    })
-                else:
-                    failed += 1
-                    items.append({"success": False, "error": r.get("error")})
-                processed += 1
+            for t in result['transactions']:
+                items.append({
+                    "success": True,
+                    "transaction_id": t['id'],
+                    "vendor": t['vendor'],
+                    "amount": t['amount'],
+                    "category": t['category'],
+                })
+            items.extend({"success": False, "error": error} for error in result['errors'])
+            success += len(result['transactions'])
+            failed += len(result['errors'])
+            processed += len(chunk)
 
             processing_results[job_id] = {
                 "status": "running",
@@ -216,59 +189,34 @@ async def process_sms_batch_local_async(job_id: str, sms_items: List[Dict[str, A
     failed = 0
     items: List[Dict[str, Any]] = []
 
-    def _process_one_sync(sms_item: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_chunk_sync(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
         db = SessionLocal()
         try:
-            # Extract metadata if available
-            sms_text = sms_item.get('sms_text') or sms_item.get('text') or str(sms_item)
-            sender = sms_item.get('sender')
-            device_timestamp = sms_item.get('device_timestamp')
-            
-            # Pass metadata to controller for fingerprint dedup
-            result = transaction_controller.parse_sms_local_quick(
-                db, 
-                sms_text, 
-                user_id=user_id,
-                sender=sender,
-                device_timestamp=device_timestamp
-            )
-            t = result['transaction']
-            return {
-                "ok": True,
-                "transaction_id": t.id,
-                "vendor": t.vendor,
-                "amount": t.amount,
-                "category": t.category,
-            }
-        except Exception as e:
-            return {"ok": False, "error": str(e)}
+            # One preload, one bulk INSERT and one commit per chunk
+            return transaction_controller.parse_sms_local_batch(db, chunk, user_id=user_id)
         finally:
             db.close()
 
     try:
         n = len(sms_items)
         i = 0
+        loop = asyncio.get_running_loop()
         while i < n:
             chunk = sms_items[i:i + max(1, batch_size)]
-            # OPTIMIZED: Process entire chunk in parallel using gather
-            loop = asyncio.get_running_loop()
-            tasks = [loop.run_in_executor(None, _process_one_sync, item) for item in chunk]
-            results = await asyncio.gather(*tasks)
+            result = await loop.run_in_executor(None, _process_chunk_sync, chunk)
 
-            for r in results:
-                if r.get("ok"):
-                    success += 1
-                    items.append({
-                        "success": True,
-                        "transaction_id": r.get("transaction_id"),
-                        "vendor": r.get("vendor"),
-                        "amount": r.get("amount"),
-                        "category": r.get("category"),
-                    })
-                else:
-                    failed += 1
-                    items.append({"success": False, "error": r.get("error")})
-                processed += 1
+            for t in result['transactions']:
+                items.append({
+                    "success": True,
+                    "transaction_id": t['id'],
+                    "vendor": t['vendor'],
+                    "amount": t['amount'],
+                    "category": t['category'],
+                })
+            items.extend({"success": False, "error": error} for error in result['errors'])
+            success += len(result['transactions'])
+            failed += len(result['errors'])
+            processed += len(chunk)
 
             processing_results[job_id] = {
                 "status": "running",
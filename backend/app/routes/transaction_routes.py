@@ -1,10 +1,11 @@
 """Transaction routes"""
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from app.config.database import get_db
-from app.controllers.transaction_controller import TransactionController
+from app.controllers.transaction_controller import transaction_controller
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.transaction import Transaction
@@ -12,9 +13,6 @@ from datetime import datetime
 
 router = APIRouter(prefix="/v1", tags=["transactions"])
 
-# Initialize controller
-transaction_controller = TransactionController()
-
 # Helper to serialize dates for responses
 
 def _date_to_str(d):
@@ -38,6 +36,14 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SMSBatchRequest(BaseModel):
+    sms_messages: List[SMSRequest]
+
+class SMSBatchResponse(BaseModel):
+    transactions: List[TransactionResponse]
+    failed: int
+    errors: List[str]
+
 class TransactionCreate(BaseModel):
     vendor: str
     amount: float
@@ -60,6 +66,8 @@ async def parse_sms(
         sender=request.sender,
         device_timestamp=request.device_timestamp
     )
+    if not result['success']:
+        raise HTTPException(status_code=400, detail=result['error'])
     transaction = result['transaction']
     
     return TransactionResponse(
@@ -98,6 +106,58 @@ async def parse_sms_local(
         confidence=transaction.confidence
     )
 
+def _batch_response(result) -> SMSBatchResponse:
+    """Build the batch response from a controller batch result"""
+    return SMSBatchResponse(
+        transactions=[
+            TransactionResponse(
+                id=t['id'],
+                vendor=t['vendor'],
+                amount=t['amount'],
+                date=_date_to_str(t['date']),
+                category=t['category'],
+                sms_text=t['sms_text'],
+                confidence=t['confidence']
+            )
+            for t in result['transactions']
+        ],
+        failed=len(result['errors']),
+        errors=result['errors']
+    )
+
+@router.post("/parse-sms-batch", response_model=SMSBatchResponse)
+async def parse_sms_batch(
+    request: SMSBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Parse many SMS with the LLM concurrently and store them in a single commit"""
+    result = await transaction_controller.parse_sms_batch(
+        db,
+        [m.model_dump() for m in request.sms_messages],
+        user_id=current_user.id
+    )
+    return _batch_response(result)
+
+@router.post("/parse-sms-batch-local", response_model=SMSBatchResponse)
+async def parse_sms_batch_local(
+    request: SMSBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Parse many SMS with the local regex parser and store them in a single commit"""
+    # Parsing and the bulk INSERT are synchronous; run them off the event
+    # loop so a large batch doesn't stall every other request meanwhile
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        None,
+        transaction_controller.parse_sms_local_batch,
+        db,
+        [m.model_dump() for m in request.sms_messages],
+        current_user.id
+    )
+    return _batch_response(result)
+
 # Public parse-sms endpoints removed - use /parse-sms with authentication
 
 
@@ -108,11 +168,16 @@ async def parse_sms_local(
 async def get_transactions(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    before_id: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get user's transactions"""
-    transactions = transaction_controller.get_transactions(db, current_user.id, limit, offset)
+    """Get user's transactions, newest first
+    
+    For deep paging pass the last id of the previous page as ``before_id``
+    instead of growing ``offset``.
+    """
+    transactions = transaction_controller.get_transactions(db, current_user.id, limit, offset, before_id)
     
     return [
         TransactionResponse(
@@ -1,4 +1,5 @@
 """Batch transaction processor for re-processing existing transactions with Ollama"""
+import asyncio
 import time
 import logging
 from typing import List, Dict, Any, Optional
@@ -55,12 +56,14 @@ class BatchTransactionProcessor:
             
         Returns:
             Processing result dictionary
+            
+        Updates are left pending on ``db``; the caller commits them.
         """
         try:
             logger.info(f"Processing transaction ID {transaction.id}: {transaction.sms_text[:50]}...")
             
             # Parse with Ollama
-            result = self.ollama_assistant.parse_sms_transaction(transaction.sms_text)
+            result = asyncio.run(self.ollama_assistant.parse_sms_transaction(transaction.sms_text))
             
             if result['success']:
                 transaction_data = result['transaction_data']
@@ -129,13 +132,9 @@ class BatchTransactionProcessor:
                         transaction.transaction_id = new_transaction_id
                         updates_made.append(f"transaction_id: -> '{new_transaction_id}'")
                 
-                # Update timestamp
+                # Update timestamp; process_batch commits the whole batch at once
                 transaction.updated_at = datetime.now()
                 
-                # Commit changes
-                db.commit()
-                db.refresh(transaction)
-                
                 return {
                     'success': True,
                     'transaction_id': transaction.id,
@@ -195,6 +194,16 @@ class BatchTransactionProcessor:
             # Small delay between individual transactions
             time.sleep(0.5)
         
+        # One commit (and fsync) per batch instead of one per transaction
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to commit batch: {e}")
+            for result in results:
+                if result['success']:
+                    result.update(success=False, error=str(e), updates_made=[])
+        
         batch_processing_time = time.time() - batch_start_time
         
         # Calculate statistics
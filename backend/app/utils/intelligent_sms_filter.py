@@ -13,60 +13,110 @@ class SMSType(Enum):
     SPAM = "spam"
     UNKNOWN = "unknown"
 
+# Every pattern is paired with literals (any-of) that a match must contain
+# in the lowercased text. A substring test rules most patterns out before
+# the regex engine runs - several of them backtrack over ".*" and used to
+# dominate the per-SMS cost. Patterns are compiled once at import.
+
+# Real transaction indicators (strong signals)
+_TRANSACTION_KEYWORDS = (
+    (('debited', 'credited', 'paid', 'received', 'withdrawn', 'deposited', 'transferred'),
+     r'\b(debited|credited|paid|received|withdrawn|deposited|transferred)\b'),
+    (('rs',), r'\bRs\.?\s*\d+\.?\d*\s*(debited|credited|paid|received)'),
+    (('upi',), r'\bUPI\s+(Ref|ID|Transaction)'),
+    (('a/c',), r'\bA/C\s+.*\s+(debited|credited)'),
+    (('account',), r'\baccount.*\s+(debited|credited)'),
+    (('balance',), r'\bbalance.*Rs\.?\s*\d+'),
+    (('transaction',), r'\btransaction\s+(successful|completed|failed)'),
+    (('payment',), r'\bpayment.*\s+(successful|completed|failed)'),
+)
+
+# Promotional message indicators (exclude these)
+_PROMOTIONAL_KEYWORDS = (
+    (('offer', 'discount', 'cashback', 'reward', 'gift', 'free', 'congratulations', 'winner'),
+     r'\b(offer|discount|cashback|reward|gift|free|congratulations|winner)\b'),
+    (('claim', 'earn', 'grab', 'get', 'win', 'bonus', 'prize'),
+     r'\b(claim|earn|grab|get|win|bonus|prize)\b'),
+    (('upgrade', 'recharge', 'subscription'), r'\b(upgrade|recharge.*plan|subscription.*offer)\b'),
+    (('limited', 'hurry', 'act', "don't"), r'\b(limited.*time|hurry|act.*now|don\'t.*miss)\b'),
+    (('click', 'visit', 'download', 'install', 'register'),
+     r'\b(click|visit|download|install|register)\b'),
+    (('thank', 'welcome', 'enjoy', 'experience'),
+     r'\b(thank.*you.*staying|welcome.*to|enjoy|experience)\b'),
+)
+
+# Notification indicators (exclude these)
+_NOTIFICATION_KEYWORDS = (
+    (('alert', 'notification', 'reminder', 'update', 'expir', 'due', 'limit'),
+     r'\b(alert|notification|reminder|update|expir|due|limit)\b'),
+    (('plan', 'validity', 'service'), r'\b(plan.*expir|validity.*expir|service.*activ)\b'),
+    (('data', 'balance', 'recharge'), r'\b(data.*usage|balance.*low|recharge.*now)\b'),
+    (('otp', 'verification', 'confirm', 'activate'), r'\b(otp|verification|confirm|activate)\b'),
+    (('statement', 'summary', 'report'), r'\b(statement|summary|report)\b'),
+)
+
+# Spam indicators (exclude these)
+_SPAM_KEYWORDS = (
+    (('lottery', 'jackpot', 'million', 'crore', 'lakh'), r'\b(lottery|jackpot|million|crore|lakh.*won)\b'),
+    (('urgent', 'immediate', 'action'), r'\b(urgent|immediate|action.*required)\b'),
+    (('call', 'sms', 'reply'), r'\b(call.*now|sms.*stop|reply.*stop)\b'),
+)
+
+# Strong transaction patterns (amount + action)
+_STRONG_TRANSACTION_PATTERNS = (
+    (('rs',), r'Rs\.?\s*\d+\.?\d*\s*(debited|credited|paid|received)'),
+    (('rs',), r'(debited|credited|paid|received).*Rs\.?\s*\d+\.?\d*'),
+    (('xx',), r'A/C.*XX\d+.*(debited|credited).*Rs\.?\s*\d+'),
+    (('rs',), r'UPI.*Rs\.?\s*\d+\.?\d*'),
+)
+
+# Bank/financial institution senders
+_FINANCIAL_SENDERS = (
+    r'.*BANK.*', r'.*-BANK-.*', r'.*HDFC.*', r'.*ICICI.*',
+    r'.*SBI.*', r'.*AXIS.*', r'.*KOTAK.*', r'.*CANARA.*',
+    r'.*PAYTM.*', r'.*GPAY.*', r'.*PHONEPE.*', r'.*UPI.*'
+)
+
+
+def _compile(patterns):
+    return tuple((literals, re.compile(p, re.IGNORECASE)) for literals, p in patterns)
+
+
+_TRANSACTION_RES = _compile(_TRANSACTION_KEYWORDS)
+_PROMOTIONAL_RES = _compile(_PROMOTIONAL_KEYWORDS)
+_NOTIFICATION_RES = _compile(_NOTIFICATION_KEYWORDS)
+_SPAM_RES = _compile(_SPAM_KEYWORDS)
+_STRONG_TRANSACTION_RES = _compile(_STRONG_TRANSACTION_PATTERNS)
+# All sender patterns are ".*NAME.*", so one alternation decides in a single pass
+_FINANCIAL_SENDER_RE = re.compile(
+    '.*(?:' + '|'.join(p[2:-2] for p in _FINANCIAL_SENDERS) + ')', re.IGNORECASE
+)
+
+_AMOUNT_RE = re.compile(r'Rs\.?\s*\d+\.?\d*')
+_HAS_AMOUNT_RE = re.compile(r'Rs\.?\s*\d+')
+_TRANSFER_RAIL_RE = re.compile(r'UPI|NEFT|RTGS|IMPS', re.IGNORECASE)
+_ACCOUNT_NUMBER_RE = re.compile(r'A/C.*XX\d+')
+_OUTCOME_RE = re.compile(r'(successful|completed|failed)', re.IGNORECASE)
+
+
+def _count_matches(patterns, text: str) -> int:
+    """Number of patterns that match ``text``, skipping prefiltered-out ones"""
+    return sum(
+        1 for literals, pattern in patterns
+        if any(literal in text for literal in literals) and pattern.search(text)
+    )
+
+
 class IntelligentSMSFilter:
     def __init__(self):
-        # Real transaction indicators (strong signals)
-        self.transaction_keywords = [
-            r'\b(debited|credited|paid|received|withdrawn|deposited|transferred)\b',
-            r'\bRs\.?\s*\d+\.?\d*\s*(debited|credited|paid|received)',
-            r'\bUPI\s+(Ref|ID|Transaction)',
-            r'\bA/C\s+.*\s+(debited|credited)',
-            r'\baccount.*\s+(debited|credited)',
-            r'\bbalance.*Rs\.?\s*\d+',
-            r'\btransaction\s+(successful|completed|failed)',
-            r'\bpayment.*\s+(successful|completed|failed)',
-        ]
-        
-        # Promotional message indicators (exclude these)
-        self.promotional_keywords = [
-            r'\b(offer|discount|cashback|reward|gift|free|congratulations|winner)\b',
-            r'\b(claim|earn|grab|get|win|bonus|prize)\b',
-            r'\b(upgrade|recharge.*plan|subscription.*offer)\b',
-            r'\b(limited.*time|hurry|act.*now|don\'t.*miss)\b',
-            r'\b(click|visit|download|install|register)\b',
-            r'\b(thank.*you.*staying|welcome.*to|enjoy|experience)\b',
-        ]
-        
-        # Notification indicators (exclude these)
-        self.notification_keywords = [
-            r'\b(alert|notification|reminder|update|expir|due|limit)\b',
-            r'\b(plan.*expir|validity.*expir|service.*activ)\b',
-            r'\b(data.*usage|balance.*low|recharge.*now)\b',
-            r'\b(otp|verification|confirm|activate)\b',
-            r'\b(statement|summary|report)\b',
-        ]
-        
-        # Spam indicators (exclude these)
-        self.spam_keywords = [
-            r'\b(lottery|jackpot|million|crore|lakh.*won)\b',
-            r'\b(urgent|immediate|action.*required)\b',
-            r'\b(call.*now|sms.*stop|reply.*stop)\b',
-        ]
-        
-        # Strong transaction patterns (amount + action)
-        self.strong_transaction_patterns = [
-            r'Rs\.?\s*\d+\.?\d*\s*(debited|credited|paid|received)',
-            r'(debited|credited|paid|received).*Rs\.?\s*\d+\.?\d*',
-            r'A/C.*XX\d+.*(debited|credited).*Rs\.?\s*\d+',
-            r'UPI.*Rs\.?\s*\d+\.?\d*',
-        ]
-        
-        # Bank/financial institution senders
-        self.financial_senders = [
-            r'.*BANK.*', r'.*-BANK-.*', r'.*HDFC.*', r'.*ICICI.*', 
-            r'.*SBI.*', r'.*AXIS.*', r'.*KOTAK.*', r'.*CANARA.*',
-            r'.*PAYTM.*', r'.*GPAY.*', r'.*PHONEPE.*', r'.*UPI.*'
-        ]
+        # Pattern sources, kept for introspection; matching uses the
+        # precompiled module-level tables
+        self.transaction_keywords = [p for _, p in _TRANSACTION_KEYWORDS]
+        self.promotional_keywords = [p for _, p in _PROMOTIONAL_KEYWORDS]
+        self.notification_keywords = [p for _, p in _NOTIFICATION_KEYWORDS]
+        self.spam_keywords = [p for _, p in _SPAM_KEYWORDS]
+        self.strong_transaction_patterns = [p for _, p in _STRONG_TRANSACTION_PATTERNS]
+        self.financial_senders = list(_FINANCIAL_SENDERS)
 
     def classify_sms(self, sms_text: str, sender: str = "") -> Tuple[SMSType, float, str]:
         """
@@ -79,17 +129,19 @@ class IntelligentSMSFilter:
         sender_lower = sender.lower()
         
         # Check for strong transaction patterns first
-        for pattern in self.strong_transaction_patterns:
-            if re.search(pattern, sms_lower, re.IGNORECASE):
-                return SMSType.REAL_TRANSACTION, 0.95, f"Strong transaction pattern: {pattern}"
+        for literals, pattern in _STRONG_TRANSACTION_RES:
+            if any(literal in sms_lower for literal in literals) and pattern.search(sms_lower):
+                return SMSType.REAL_TRANSACTION, 0.95, f"Strong transaction pattern: {pattern.pattern}"
         
         # Check if sender is financial institution
-        is_financial_sender = any(re.match(pattern, sender_lower, re.IGNORECASE) 
-                                for pattern in self.financial_senders)
+        is_financial_sender = _FINANCIAL_SENDER_RE.match(sender_lower) is not None
+        
+        # Transaction keywords feed both the transaction and promotional scores
+        transaction_hits = _count_matches(_TRANSACTION_RES, sms_lower)
         
         # Score different aspects
-        transaction_score = self._calculate_transaction_score(sms_lower)
-        promotional_score = self._calculate_promotional_score(sms_lower)
+        transaction_score = self._calculate_transaction_score(sms_lower, transaction_hits)
+        promotional_score = self._calculate_promotional_score(sms_lower, transaction_hits)
         notification_score = self._calculate_notification_score(sms_lower)
         spam_score = self._calculate_spam_score(sms_lower)
         
@@ -115,9 +167,8 @@ class IntelligentSMSFilter:
         # Special rules to prevent false positives
         if max_type == SMSType.REAL_TRANSACTION:
             # Must have amount AND action for real transaction
-            has_amount = re.search(r'Rs\.?\s*\d+', sms_lower)
-            has_action = any(re.search(keyword, sms_lower, re.IGNORECASE) 
-                           for keyword in self.transaction_keywords)
+            has_amount = 'rs' in sms_lower and _HAS_AMOUNT_RE.search(sms_lower)
+            has_action = transaction_hits > 0
             
             if not (has_amount and has_action):
                 # Reclassify as promotional or notification
@@ -128,38 +179,44 @@ class IntelligentSMSFilter:
         
         return max_type, max_score, f"Highest score: {max_score:.2f}"
 
-    def _calculate_transaction_score(self, text: str) -> float:
+    def classify_batch(self, sms_list: List[Dict]) -> List[Tuple[SMSType, float, str]]:
+        """classify_sms for each SMS dict ('text' and optionally 'sender'), in order"""
+        classify = self.classify_sms
+        return [classify(sms.get('text', ''), sms.get('sender', '')) for sms in sms_list]
+
+    def _calculate_transaction_score(self, text: str, transaction_hits: Optional[int] = None) -> float:
         """Calculate likelihood of being a real transaction"""
+        if transaction_hits is None:
+            transaction_hits = _count_matches(_TRANSACTION_RES, text)
         score = 0.0
         
-        for pattern in self.transaction_keywords:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.3
+        for _ in range(transaction_hits):
+            score += 0.3
         
         # Bonus for specific transaction elements
-        if re.search(r'Rs\.?\s*\d+\.?\d*', text):
+        if 'rs' in text and _AMOUNT_RE.search(text):
             score += 0.2
-        if re.search(r'UPI|NEFT|RTGS|IMPS', text, re.IGNORECASE):
+        if _TRANSFER_RAIL_RE.search(text):
             score += 0.2
-        if re.search(r'A/C.*XX\d+', text):
+        if 'xx' in text and _ACCOUNT_NUMBER_RE.search(text):
             score += 0.2
-        if re.search(r'(successful|completed|failed)', text, re.IGNORECASE):
+        if _OUTCOME_RE.search(text):
             score += 0.1
             
         return min(score, 1.0)
 
-    def _calculate_promotional_score(self, text: str) -> float:
+    def _calculate_promotional_score(self, text: str, transaction_hits: Optional[int] = None) -> float:
         """Calculate likelihood of being promotional"""
+        if transaction_hits is None:
+            transaction_hits = _count_matches(_TRANSACTION_RES, text)
         score = 0.0
         
-        for pattern in self.promotional_keywords:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.25
+        for _ in range(_count_matches(_PROMOTIONAL_RES, text)):
+            score += 0.25
         
         # Penalty for transaction keywords
-        for pattern in self.transaction_keywords:
-            if re.search(pattern, text, re.IGNORECASE):
-                score -= 0.2
+        for _ in range(transaction_hits):
+            score -= 0.2
                 
         return max(score, 0.0)
 
@@ -167,9 +224,8 @@ class IntelligentSMSFilter:
         """Calculate likelihood of being notification"""
         score = 0.0
         
-        for pattern in self.notification_keywords:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.25
+        for _ in range(_count_matches(_NOTIFICATION_RES, text)):
+            score += 0.25
                 
         return min(score, 1.0)
 
@@ -177,9 +233,8 @@ class IntelligentSMSFilter:
         """Calculate likelihood of being spam"""
         score = 0.0
         
-        for pattern in self.spam_keywords:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.4
+        for _ in range(_count_matches(_SPAM_RES, text)):
+            score += 0.4
                 
         return min(score, 1.0)
 
@@ -195,12 +250,7 @@ class IntelligentSMSFilter:
         """
         real_transactions = []
         
-        for sms in sms_list:
-            sms_text = sms.get('text', '')
-            sender = sms.get('sender', '')
-            
-            sms_type, confidence, reason = self.classify_sms(sms_text, sender)
-            
+        for sms, (sms_type, confidence, reason) in zip(sms_list, self.classify_batch(sms_list)):
             if sms_type == SMSType.REAL_TRANSACTION and confidence > 0.6:
                 sms['classification'] = {
                     'type': sms_type.value,
@@ -225,12 +275,10 @@ class IntelligentSMSFilter:
             'details': []
         }
         
-        for sms in sms_list:
+        for sms, (sms_type, confidence, reason) in zip(sms_list, self.classify_batch(sms_list)):
             sms_text = sms.get('text', '')
             sender = sms.get('sender', '')
             
-            sms_type, confidence, reason = self.classify_sms(sms_text, sender)
-            
             results['details'].append({
                 'text': sms_text[:100] + '...' if len(sms_text) > 100 else sms_text,
                 'sender': sender,
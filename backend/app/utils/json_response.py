@@ -0,0 +1,17 @@
+"""orjson-rendered JSON responses for routes that return plain dicts"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered by orjson instead of json.dumps
+
+    Meant for routers whose endpoints return dicts. Endpoints with a
+    response_model are left on FastAPI's default class: recent FastAPI
+    serializes those straight to bytes with Pydantic, and any custom
+    response class turns that fast path off.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
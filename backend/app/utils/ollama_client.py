@@ -0,0 +1,138 @@
+"""Shared async HTTP client for Ollama requests"""
+import asyncio
+from typing import Any, Dict, Optional
+import httpx
+import orjson
+from app.config.settings import settings
+
+# One pooled client per event loop. Connections are bound to the loop that
+# opened them, so offline scripts that call asyncio.run() repeatedly get a
+# fresh client instead of reusing sockets from a closed loop.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Bounds concurrent generate_json calls app-wide; bound to the same loop
+_parse_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_ollama_client() -> httpx.AsyncClient:
+    """Return the shared Ollama client, creating it if needed"""
+    global _client, _client_loop, _parse_slots
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        # Generations take seconds, so keep idle connections well past
+        # httpx's 5s default or every burst of SMS reconnects
+        limits = httpx.Limits(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS // 2 or 1,
+            keepalive_expiry=60.0
+        )
+        _client = httpx.AsyncClient(
+            base_url=settings.OLLAMA_HOST,
+            timeout=120.0,
+            transport=httpx.AsyncHTTPTransport(uds=settings.OLLAMA_SOCKET, limits=limits)
+        )
+        _client_loop = loop
+        _parse_slots = asyncio.Semaphore(max(1, settings.OLLAMA_MAX_CONCURRENT_PARSES))
+    return _client
+
+
+async def close_ollama_client():
+    """Close the shared Ollama client (called on app shutdown)"""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+class _JsonObjectScanner:
+    """Finds the end of the first top-level JSON object in streamed text"""
+    
+    def __init__(self):
+        self.text = ""
+        self.start = -1
+        self.end = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Append a chunk; return True once the object is complete"""
+        offset = len(self.text)
+        self.text += chunk
+        for i in range(offset, len(self.text)):
+            c = self.text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                # Quotes outside the object (prose, fences) are not JSON strings
+                self._in_string = self.start >= 0
+            elif c == '{':
+                if self.start < 0:
+                    self.start = i
+                self._depth += 1
+            elif c == '}' and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    self.end = i + 1
+                    return True
+        return False
+
+
+async def generate_json(
+    payload: Dict[str, Any],
+    url: str = "/api/generate",
+    timeout: float = 120.0
+) -> str:
+    """Stream an /api/generate request and return the JSON object text
+    
+    Reading stops as soon as the top-level object closes, which closes the
+    connection and lets Ollama stop generating - models in JSON mode often
+    keep emitting whitespace long after the object is done. If the stream
+    ends without a complete object the raw generated text is returned.
+    
+    At most OLLAMA_MAX_CONCURRENT_PARSES calls run at once across the app;
+    Ollama only decodes a few requests in parallel, so extra ones would sit
+    in its queue holding a pooled connection and eating into their timeout.
+    """
+    client = get_ollama_client()
+    async with _parse_slots:
+        return await _stream_json(client, payload, url, timeout)
+
+
+async def _stream_json(
+    client: httpx.AsyncClient,
+    payload: Dict[str, Any],
+    url: str,
+    timeout: float
+) -> str:
+    """Body of generate_json, run while holding a parse slot"""
+    scanner = _JsonObjectScanner()
+    request = dict(payload, stream=True)
+    request.setdefault('keep_alive', settings.OLLAMA_KEEP_ALIVE)
+    async with client.stream(
+        "POST", url, content=orjson.dumps(request),
+        headers={"Content-Type": "application/json"},
+        timeout=timeout
+    ) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise httpx.HTTPError(
+                f"Ollama API returned status {response.status_code}: {response.text}"
+            )
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            if 'error' in chunk:
+                raise httpx.HTTPError(f"Ollama API error: {chunk['error']}")
+            if scanner.feed(chunk.get('response', '')):
+                return scanner.text[scanner.start:scanner.end]
+            if chunk.get('done'):
+                break
+    return scanner.text
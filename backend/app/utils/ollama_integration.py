@@ -1,8 +1,10 @@
 """Ollama AI integration for intelligent SMS parsing"""
 import json
-import requests
+import httpx
+import orjson
 from typing import Dict, Any, Optional
 from app.config.settings import settings
+from app.utils.ollama_client import get_ollama_client, generate_json
 
 
 class OllamaAssistant:
@@ -15,7 +17,7 @@ class OllamaAssistant:
         self.host = host or settings.OLLAMA_HOST
         self.initialized = True  # Assume Ollama is available locally
     
-    def parse_sms_transaction(self, sms_text: str) -> Dict[str, Any]:
+    async def parse_sms_transaction(self, sms_text: str) -> Dict[str, Any]:
         """Parse SMS using Ollama AI for intelligent extraction
         
         Args:
@@ -27,9 +29,7 @@ class OllamaAssistant:
         try:
             # Construct detailed prompt for the LLM
             prompt = f"""
-            Analyze this SMS and determine if it's a real financial transaction. If it is, extract the details.
-            
-            SMS: "{sms_text}"
+            Analyze the SMS below and determine if it's a real financial transaction. If it is, extract the details.
             
             If it's a REAL transaction (money debited/credited), return:
             {{
@@ -61,36 +61,27 @@ class OllamaAssistant:
             - Set high confidence only for clear, unambiguous transactions
             - Return ONLY the JSON object, no additional text
             - Ensure the output is valid JSON format
+            
+            SMS: "{sms_text}"
             """
             
             # Prepare API request payload
             payload = {
                 "model": "mistral:7b-instruct-q4_K_M",  # Using the model you mentioned
                 "prompt": prompt,
-                "stream": False,
                 "format": "json"
             }
             
-            # Make API request to Ollama
-            response = requests.post(
-                f"{self.host}/api/generate",
-                json=payload,
+            # Stream the generation, stopping as soon as the JSON object is complete
+            llm_response = await generate_json(
+                payload,
+                url=f"{self.host}/api/generate",
                 timeout=180  # 3 minute timeout for LLM parsing
             )
             
-            # Check response status
-            if response.status_code != 200:
-                raise requests.exceptions.RequestException(
-                    f"Ollama API returned status {response.status_code}: {response.text}"
-                )
-            
-            # Parse the response
-            response_data = response.json()
-            llm_response = response_data.get('response', '')
-            
             # Parse the LLM's JSON response
             try:
-                parsed_data = json.loads(llm_response)
+                parsed_data = orjson.loads(llm_response)
             except json.JSONDecodeError as json_err:
                 # Try to clean the response if it has extra formatting
                 cleaned_response = llm_response.strip()
@@ -100,7 +91,7 @@ class OllamaAssistant:
                     cleaned_response = cleaned_response[3:-3].strip()
                 
                 try:
-                    parsed_data = json.loads(cleaned_response)
+                    parsed_data = orjson.loads(cleaned_response)
                 except json.JSONDecodeError:
                     raise json.JSONDecodeError(
                         f"Failed to parse LLM response as JSON: {llm_response}",
@@ -122,7 +113,7 @@ class OllamaAssistant:
                 'is_promotional': False
             }
             
-        except requests.exceptions.RequestException as req_err:
+        except httpx.HTTPError as req_err:
             print(f"Ollama API request error: {req_err}")
             return {
                 'success': False,
@@ -146,7 +137,7 @@ class OllamaAssistant:
                 'is_promotional': False
             }
     
-    def analyze_spending_patterns(self, transactions: list) -> Dict[str, Any]:
+    async def analyze_spending_patterns(self, transactions: list) -> Dict[str, Any]:
         """Analyze spending patterns using Ollama AI
         
         Args:
@@ -199,18 +190,19 @@ class OllamaAssistant:
                 "format": "json"
             }
             
-            response = requests.post(
+            response = await get_ollama_client().post(
                 f"{self.host}/api/generate",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=120  # 2 minute timeout for analysis
             )
             
             if response.status_code != 200:
-                raise requests.exceptions.RequestException(
+                raise httpx.HTTPError(
                     f"Ollama API returned status {response.status_code}"
                 )
             
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             llm_response = response_data.get('response', '')
             
             # Clean and parse response
@@ -244,18 +236,19 @@ class OllamaAssistant:
                 "stream": False
             }
             
-            response = requests.post(
+            response = await get_ollama_client().post(
                 f"{self.host}/api/generate",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=120  # 2 minute timeout for general responses
             )
             
             if response.status_code != 200:
-                raise requests.exceptions.RequestException(
+                raise httpx.HTTPError(
                     f"Ollama API returned status {response.status_code}: {response.text}"
                 )
             
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             return {
                 'success': True,
                 'response': response_data.get('response', ''),
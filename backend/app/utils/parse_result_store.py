@@ -0,0 +1,82 @@
+"""Persistent SMS parse-result cache, so warm parses survive restarts"""
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+import orjson
+
+_DAY = 86400.0
+
+
+class ParseResultStore:
+    """SQLite key-value store of LLM parse results keyed by SMS digest
+
+    Sits behind the controller's in-memory TTL cache: a restart empties that
+    cache, and without this every recurring bank template would go back to
+    the LLM. Entries unused for ``max_age_days`` are evicted on open and
+    then at most once a day as new results are written. It is only a cache:
+    SQLite errors and undecodable values are swallowed and read as a miss.
+    """
+
+    def __init__(self, path: str, max_age_days: int = 30):
+        self.path = path
+        self.max_age = max_age_days * _DAY
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_evicted = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the store on first use (caller holds the lock)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sms_parse_cache ("
+                "key BLOB PRIMARY KEY, value BLOB NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sms_parse_cache_used_at ON sms_parse_cache(used_at)")
+            self._conn = conn
+            self._evict(time.time())
+        return self._conn
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM sms_parse_cache WHERE used_at < ?", (now - self.max_age,))
+        self._last_evicted = now
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the stored parse for ``key``, or None"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value, used_at FROM sms_parse_cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                # Refresh the LRU stamp at most daily so hits are reads, not writes
+                if now - row[1] > _DAY:
+                    conn.execute("UPDATE sms_parse_cache SET used_at = ? WHERE key = ?", (now, key))
+            return orjson.loads(row[0])
+        except (sqlite3.Error, orjson.JSONDecodeError):
+            return None
+
+    def set(self, key: bytes, value: Dict[str, Any]):
+        """Store the parse for ``key``"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO sms_parse_cache (key, value, used_at) VALUES (?, ?, ?)",
+                    (key, orjson.dumps(value), now)
+                )
+                if now - self._last_evicted > _DAY:
+                    self._evict(now)
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -4,9 +4,9 @@ Intelligently classifies and parses different types of financial SMS messages
 """
 import re
 import json
-import requests
+import orjson
 from typing import Dict, Any, Optional
-from app.config.settings import settings
+from app.utils.ollama_client import generate_json
 
 
 # Classification keywords for quick identification
@@ -114,35 +114,27 @@ async def get_ollama_response(prompt: str) -> Dict[str, Any]:
         payload = {
             "model": "mistral:7b-instruct-q4_K_M",
             "prompt": prompt,
-            "stream": False,
             "format": "json"
         }
         
-        response = requests.post(
-            f"{settings.OLLAMA_HOST}/api/generate",
-            json=payload,
+        # Streamed; returns as soon as the JSON object is complete
+        llm_response = await generate_json(
+            payload,
             timeout=120  # 2 minute timeout for SMS classification
         )
         
-        if response.status_code == 200:
-            response_data = response.json()
-            llm_response = response_data.get('response', '{}')
+        # Clean and parse JSON response
+        try:
+            # Remove markdown formatting if present
+            cleaned_response = llm_response.strip() or '{}'
+            if cleaned_response.startswith('```json'):
+                cleaned_response = cleaned_response[7:-3].strip()
+            elif cleaned_response.startswith('```'):
+                cleaned_response = cleaned_response[3:-3].strip()
             
-            # Clean and parse JSON response
-            try:
-                # Remove markdown formatting if present
-                cleaned_response = llm_response.strip()
-                if cleaned_response.startswith('```json'):
-                    cleaned_response = cleaned_response[7:-3].strip()
-                elif cleaned_response.startswith('```'):
-                    cleaned_response = cleaned_response[3:-3].strip()
-                
-                return json.loads(cleaned_response)
-            except json.JSONDecodeError:
-                print(f"Failed to parse JSON: {llm_response}")
-                return {}
-        else:
-            print(f"Ollama API error: {response.status_code}")
+            return orjson.loads(cleaned_response)
+        except json.JSONDecodeError:
+            print(f"Failed to parse JSON: {llm_response}")
             return {}
             
     except Exception as e:
@@ -153,9 +145,7 @@ async def get_ollama_response(prompt: str) -> Dict[str, Any]:
 async def parse_upi_sms(sms_text: str) -> Dict[str, Any]:
     """Parse UPI SMS with specialized extraction"""
     prompt = f"""
-    Extract UPI transaction details from this SMS. Focus on UPI-specific information.
-    
-    SMS: "{sms_text}"
+    Extract UPI transaction details from the SMS below. Focus on UPI-specific information.
     
     Return JSON with these fields:
     {{
@@ -169,6 +159,8 @@ async def parse_upi_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     Extract the exact UPI reference number/transaction ID if present.
+    
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -184,9 +176,7 @@ async def parse_upi_sms(sms_text: str) -> Dict[str, Any]:
 async def parse_credit_card_sms(sms_text: str) -> Dict[str, Any]:
     """Parse Credit Card SMS with specialized extraction"""
     prompt = f"""
-    Extract credit card transaction details from this SMS.
-    
-    SMS: "{sms_text}"
+    Extract credit card transaction details from the SMS below.
     
     Return JSON with these fields:
     {{
@@ -200,6 +190,8 @@ async def parse_credit_card_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     Look for patterns like 'XXXX1234' or 'ending in 1234' for card numbers.
+    
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -215,9 +207,7 @@ async def parse_credit_card_sms(sms_text: str) -> Dict[str, Any]:
 async def parse_debit_card_sms(sms_text: str) -> Dict[str, Any]:
     """Parse Debit Card SMS with specialized extraction"""
     prompt = f"""
-    Extract debit card transaction details from this SMS.
-    
-    SMS: "{sms_text}"
+    Extract debit card transaction details from the SMS below.
     
     Return JSON with these fields:
     {{
@@ -231,6 +221,8 @@ async def parse_debit_card_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     For ATM withdrawals, set vendor as 'ATM Withdrawal'.
+    
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -248,15 +240,13 @@ async def parse_subscription_sms(sms_text: str) -> Dict[str, Any]:
     service_name = identify_subscription_service(sms_text)
     
     prompt = f"""
-    Extract subscription payment details from this SMS for service: {service_name or 'Unknown'}
-    
-    SMS: "{sms_text}"
+    Extract subscription payment details from the SMS below.
     
     Return JSON with these fields:
     {{
         "vendor": "service name (e.g., Netflix, Amazon Prime)",
         "amount": numeric_amount,
-        "subscription_service": "{service_name or 'Unknown'}",
+        "subscription_service": "the detected service name given below",
         "is_subscription": true,
         "is_recurring": true,
         "transaction_type": "debit",
@@ -265,6 +255,9 @@ async def parse_subscription_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     This is a subscription payment, so mark it as recurring.
+    
+    Service: {service_name or 'Unknown'}
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -281,9 +274,7 @@ async def parse_subscription_sms(sms_text: str) -> Dict[str, Any]:
 async def parse_net_banking_sms(sms_text: str) -> Dict[str, Any]:
     """Parse Net Banking SMS with specialized extraction"""
     prompt = f"""
-    Extract net banking transaction details from this SMS.
-    
-    SMS: "{sms_text}"
+    Extract net banking transaction details from the SMS below.
     
     Return JSON with these fields:
     {{
@@ -296,6 +287,8 @@ async def parse_net_banking_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     Look for NEFT/RTGS/IMPS reference numbers if present.
+    
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -350,9 +343,7 @@ async def classify_and_parse_sms(sms_text: str) -> Dict[str, Any]:
 async def parse_general_sms(sms_text: str) -> Dict[str, Any]:
     """Fallback parser for unclassified SMS"""
     prompt = f"""
-    Extract basic transaction details from this SMS.
-    
-    SMS: "{sms_text}"
+    Extract basic transaction details from the SMS below.
     
     Return JSON with these fields:
     {{
@@ -365,6 +356,8 @@ async def parse_general_sms(sms_text: str) -> Dict[str, Any]:
     }}
     
     If this is not a financial transaction, set confidence to 0.
+    
+    SMS: "{sms_text}"
     """
     
     response = await get_ollama_response(prompt)
@@ -0,0 +1,103 @@
+"""Reuse an LLM parse for other SMS that share its template"""
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# A run of digits with the separators amounts, dates, times and references
+# use ("1,299.00", "12/01/25", "2025-01-12:10:22:33"), one token each
+_NUMBER_RE = re.compile(r'\d(?:[\d,./:-]*\d)?')
+
+# strptime formats tried when locating the parsed date in the SMS
+_DATE_FORMATS = (
+    '%d/%m/%y', '%d/%m/%Y', '%d-%m-%y', '%d-%m-%Y', '%d.%m.%y', '%d.%m.%Y',
+    '%Y-%m-%d', '%Y-%m-%d:%H:%M:%S'
+)
+
+# Scored by the model, not read from the text
+_UNSLOTTED_FIELDS = frozenset({'confidence'})
+
+
+def template_key(sms_text: str) -> str:
+    """The SMS with every number masked, so recurring alerts share a key"""
+    return _NUMBER_RE.sub('#', sms_text)
+
+
+def _token_matches(value: Any, token: str) -> bool:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return float(token.replace(',', '')) == float(value)
+        except ValueError:
+            return False
+    return str(value) == token
+
+
+def _unique(matches: list) -> Optional[list]:
+    # Two candidate tokens (amount and balance both 500) would make the slot a guess
+    return matches[0] if len(matches) == 1 else None
+
+
+def _date_slot(value: str, tokens) -> Optional[list]:
+    """[token index, strptime format] that reproduces the YYYY-MM-DD ``value``"""
+    matches = []
+    for index, token in enumerate(tokens):
+        for date_format in _DATE_FORMATS:
+            try:
+                if datetime.strptime(token, date_format).strftime('%Y-%m-%d') == value:
+                    matches.append([index, date_format])
+                    break
+            except ValueError:
+                continue
+    return _unique(matches)
+
+
+def make_template(parsed: Dict[str, Any], sms_text: str) -> Optional[Dict[str, Any]]:
+    """Describe where each text-derived field of ``parsed`` sits in ``sms_text``
+
+    Every field whose value carries a digit (amount, date, reference, card
+    number) is pinned to a number token. Returns None when any of them can't
+    be found, since the parse then can't be replayed onto other SMS safely.
+    """
+    tokens = _NUMBER_RE.findall(sms_text)
+    slots = {}
+    date = None
+    for field, value in parsed.items():
+        if field in _UNSLOTTED_FIELDS or value is None or isinstance(value, (bool, dict, list)):
+            continue
+        if field == 'date':
+            if value == 'null':
+                continue
+            date = _date_slot(str(value), tokens)
+            if date is None:
+                return None
+            continue
+        if not any(c.isdigit() for c in str(value)):
+            continue
+        index = _unique([i for i, token in enumerate(tokens) if _token_matches(value, token)])
+        if index is None:
+            return None
+        slots[field] = [index, type(value).__name__]
+    if 'amount' not in slots:
+        return None
+    return {'parsed': parsed, 'slots': slots, 'date': date, 'tokens': len(tokens)}
+
+
+def fill_template(template: Dict[str, Any], sms_text: str) -> Optional[Dict[str, Any]]:
+    """Replay a template's parse onto ``sms_text``, or None if it doesn't fit"""
+    tokens = _NUMBER_RE.findall(sms_text)
+    if len(tokens) != template['tokens']:
+        return None
+    parsed = dict(template['parsed'])
+    try:
+        for field, (index, kind) in template['slots'].items():
+            token = tokens[index]
+            if kind in ('int', 'float'):
+                number = float(token.replace(',', ''))
+                parsed[field] = int(number) if kind == 'int' and number.is_integer() else number
+            else:
+                parsed[field] = token
+        if template['date'] is not None:
+            index, date_format = template['date']
+            parsed['date'] = datetime.strptime(tokens[index], date_format).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+    return parsed
@@ -4,11 +4,19 @@ WITHOUT modifying existing database
 """
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.transaction import Transaction
 from collections import defaultdict
 import calendar
 
+# Only what the breakdowns read; skips loading sms_text (often the widest
+# column) and building an ORM object for every transaction of the user
+_BREAKDOWN_COLUMNS = (
+    Transaction.date, Transaction.created_at, Transaction.amount,
+    Transaction.transaction_type, Transaction.category, Transaction.vendor
+)
+
 class SpendingAnalytics:
     def __init__(self):
         pass
@@ -17,8 +25,8 @@ class SpendingAnalytics:
         """Get monthly spending breakdown for the last N months"""
         
         # Get all user transactions
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user_id
+        transactions = db.execute(
+            select(*_BREAKDOWN_COLUMNS).where(Transaction.user_id == user_id)
         ).all()
         
         if not transactions:
@@ -64,12 +72,7 @@ class SpendingAnalytics:
             # Only include debit transactions for spending
             if transaction.amount and transaction.amount > 0:
                 # Check if it's a debit (spending) transaction
-                is_debit = True
-                if hasattr(transaction, 'transaction_type'):
-                    is_debit = transaction.transaction_type == 'debit'
-                elif transaction.sms_text:
-                    # Heuristic: if SMS contains "credited", it's income, not spending
-                    is_debit = 'credited' not in transaction.sms_text.lower()
+                is_debit = transaction.transaction_type == 'debit'
                 
                 if is_debit:
                     monthly_data[month_key]["total_spent"] += transaction.amount
@@ -127,8 +130,8 @@ class SpendingAnalytics:
         """Get weekly spending breakdown for the last N weeks"""
         
         # Get all user transactions
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user_id
+        transactions = db.execute(
+            select(*_BREAKDOWN_COLUMNS).where(Transaction.user_id == user_id)
         ).all()
         
         if not transactions:
@@ -173,11 +176,7 @@ class SpendingAnalytics:
             
             # Only include debit transactions for spending
             if transaction.amount and transaction.amount > 0:
-                is_debit = True
-                if hasattr(transaction, 'transaction_type'):
-                    is_debit = transaction.transaction_type == 'debit'
-                elif transaction.sms_text:
-                    is_debit = 'credited' not in transaction.sms_text.lower()
+                is_debit = transaction.transaction_type == 'debit'
                 
                 if is_debit:
                     weekly_data[week_key]["total_spent"] += transaction.amount
@@ -1,12 +1,65 @@
 """Transaction deduplication utilities"""
 import hashlib
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Set
+from sqlalchemy import bindparam, literal, select
+
+# Fingerprints cover the first 100 chars of the normalized SMS text. Only a
+# raw prefix is normalized: whitespace collapsing never moves text earlier,
+# so once the prefix yields 100 chars the rest of the message can't matter.
+# A 128-char prefix almost always does (normalization is ~9 ns/char, so the
+# scan size is most of the cost); whitespace-heavy SMS fall back to the whole text.
+_FINGERPRINT_TEXT_CHARS = 100
+_FINGERPRINT_SCAN_CHARS = 128
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint(sender: str, sms_text: str, device_timestamp: int) -> str:
+    """MD5 fingerprint of one SMS, memoized"""
+    clean_text = ' '.join(sms_text[:_FINGERPRINT_SCAN_CHARS].lower().split())
+    if len(clean_text) < _FINGERPRINT_TEXT_CHARS and len(sms_text) > _FINGERPRINT_SCAN_CHARS:
+        # Mostly whitespace up front; normalize the whole message
+        clean_text = ' '.join(sms_text.lower().split())
+    
+    # Create unique string combining all identifiers
+    unique_string = f"{sender or 'unknown'}_{device_timestamp}_{clean_text[:_FINGERPRINT_TEXT_CHARS]}"
+    
+    # MD5 hash (fast, collision-resistant enough for dedup). Stored
+    # fingerprints are MD5, so a different hash would stop resent SMS from
+    # matching the rows already in the database.
+    return hashlib.md5(unique_string.encode()).hexdigest()
+
+def sms_digest(sms_text: Optional[str]) -> Optional[str]:
+    """Fixed-size key for an exact SMS body (Transaction.sms_digest)"""
+    if not sms_text:
+        return None
+    return hashlib.blake2b(sms_text.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _fingerprint_exists_stmt():
+    """One shared statement object, so every probe hits SQLAlchemy's compiled
+    cache and the driver's per-connection prepared-statement cache"""
+    from app.models.transaction import Transaction
+    return select(literal(1)).where(Transaction.fingerprint == bindparam('fingerprint')).limit(1)
 
 class TransactionDeduplicator:
+    PRELOAD_CHUNK = 500  # values per IN (...) list in preload()
+    
     def __init__(self):
         self.recent_transactions: List[Dict[str, Any]] = []
         self.max_history = 1000  # Keep last 1000 transactions for duplicate checking
+        # Multiset indexes over recent_transactions for O(1) id/hash lookups
+        self._recent_ids: Counter = Counter()
+        self._recent_hashes: Counter = Counter()
+        # The shared controller records batches from worker threads (the local
+        # batch route runs in an executor) while the event loop records single
+        # parses, so history writes are serialized. Readers stay lock-free:
+        # the history is a best-effort duplicate heuristic.
+        self._lock = threading.Lock()
     
     def generate_fingerprint(
         self, 
@@ -25,15 +78,12 @@ class TransactionDeduplicator:
             
         Returns:
             MD5 hash string (32 chars)
-        """
-        # Normalize text: lowercase, remove extra whitespace, limit to 100 chars
-        clean_text = ' '.join(sms_text.lower().split())[:100]
-        
-        # Create unique string combining all identifiers
-        unique_string = f"{sender or 'unknown'}_{device_timestamp}_{clean_text}"
         
-        # MD5 hash (fast, collision-resistant enough for dedup)
-        return hashlib.md5(unique_string.encode()).hexdigest()
+        Text is lowercased, whitespace-collapsed and limited to 100 chars.
+        Results are memoized: a batch fingerprints each SMS once for the
+        preload and again when preparing it.
+        """
+        return _fingerprint(sender, sms_text, device_timestamp)
     
     def is_duplicate_by_fingerprint(self, fingerprint: str, db_session) -> bool:
         """
@@ -47,14 +97,54 @@ class TransactionDeduplicator:
         Returns:
             True if duplicate exists
         """
-        from app.models.transaction import Transaction
-        
-        exists = db_session.query(Transaction).filter(
-            Transaction.fingerprint == fingerprint
+        exists = db_session.execute(
+            _fingerprint_exists_stmt(), {'fingerprint': fingerprint}
         ).first()
         
         return exists is not None
     
+    def preload(
+        self,
+        db_session,
+        user_id: Optional[int],
+        fingerprints: Iterable[str],
+        sms_texts: Iterable[str]
+    ) -> Dict[str, Set[str]]:
+        """
+        Fetch the already-stored fingerprints and SMS texts for a whole batch.
+        One IN query per key replaces a lookup per SMS.
+        
+        Returns:
+            {'fingerprints': set, 'sms_texts': set} of values that exist in the DB
+        """
+        from app.models.transaction import Transaction
+        
+        fingerprints = list({f for f in fingerprints if f})
+        sms_texts = list({t for t in sms_texts if t})
+        
+        # Chunk the IN lists to stay well under SQLite's bound-parameter limit
+        existing_fingerprints = set()
+        for i in range(0, len(fingerprints), self.PRELOAD_CHUNK):
+            existing_fingerprints.update(
+                row[0] for row in db_session.query(Transaction.fingerprint)
+                .filter(Transaction.fingerprint.in_(fingerprints[i:i + self.PRELOAD_CHUNK]))
+            )
+        
+        # SMS texts are matched by digest, which idx_user_sms_digest covers
+        texts_by_digest = {sms_digest(t): t for t in sms_texts}
+        digests = list(texts_by_digest)
+        existing_sms = set()
+        for i in range(0, len(digests), self.PRELOAD_CHUNK):
+            existing_sms.update(
+                texts_by_digest[row[0]] for row in db_session.query(Transaction.sms_digest)
+                .filter(
+                    Transaction.user_id == user_id,
+                    Transaction.sms_digest.in_(digests[i:i + self.PRELOAD_CHUNK])
+                )
+            )
+        
+        return {'fingerprints': existing_fingerprints, 'sms_texts': existing_sms}
+    
     def generate_transaction_hash(self, transaction_data: Dict[str, Any]) -> str:
         """Generate hash for transaction based on key fields"""
         hash_string = f"{transaction_data.get('vendor', '')}-{transaction_data.get('amount', 0)}-{transaction_data.get('date', '')}"
@@ -65,17 +155,11 @@ class TransactionDeduplicator:
         if not transaction_id:
             return False
         
-        for recent_tx in self.recent_transactions:
-            if recent_tx.get('transaction_id') == transaction_id:
-                return True
-        return False
+        return self._recent_ids[transaction_id] > 0
     
     def is_duplicate_by_hash(self, transaction_hash: str) -> bool:
         """Check if transaction hash already exists"""
-        for recent_tx in self.recent_transactions:
-            if recent_tx.get('hash') == transaction_hash:
-                return True
-        return False
+        return self._recent_hashes[transaction_hash] > 0
     
     def is_similar_transaction(self, transaction_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Check for similar transactions within time window"""
@@ -89,17 +173,19 @@ class TransactionDeduplicator:
         # Check for similar transactions within 1 minute (as requested)
         time_window = timedelta(minutes=1)
         
-        for recent_tx in self.recent_transactions:
+        # History is appended in processing order, so walk it newest-first and
+        # stop at the first record outside the time window
+        for recent_tx in reversed(self.recent_transactions):
+            # Use the time when transaction was processed, kept as a datetime
+            # so the scan doesn't re-parse the ISO 'timestamp' of every record
+            recent_timestamp = recent_tx['processed_at']
+            if (current_timestamp - recent_timestamp) >= time_window:
+                break
+            
             recent_amount = recent_tx.get('amount', 0)
             recent_vendor = recent_tx.get('vendor', '').lower()
             recent_sms = recent_tx.get('sms_text', '').lower()
             
-            try:
-                # Use the timestamp when transaction was processed
-                recent_timestamp = datetime.fromisoformat(recent_tx.get('timestamp', ''))
-            except (ValueError, TypeError):
-                continue
-            
             # Check for duplicates based on multiple criteria:
             # 1. Same amount (exact match)
             # 2. Same vendor (case-insensitive)
@@ -173,30 +259,67 @@ class TransactionDeduplicator:
             'hash': transaction_hash
         }
     
-    def add_transaction(self, transaction_data: Dict[str, Any]):
-        """Add transaction to recent history for future duplicate checking"""
-        transaction_hash = self.generate_transaction_hash(transaction_data)
+    def add_transaction(self, transaction_data: Dict[str, Any], now: Optional[datetime] = None):
+        """Add transaction to recent history for future duplicate checking
         
-        tx_record = {
-            'vendor': transaction_data.get('vendor'),
-            'amount': transaction_data.get('amount'),
-            'date': transaction_data.get('date'),
-            'transaction_type': transaction_data.get('transaction_type'),
-            'transaction_id': transaction_data.get('transaction_id'),
-            'sms_text': transaction_data.get('sms_text'),
-            'hash': transaction_hash,
-            'timestamp': datetime.now().isoformat()
-        }
+        ``now`` lets batch callers stamp many records with one clock read.
+        """
+        self.add_transactions_bulk([transaction_data], now=now)
+    
+    def add_transactions_bulk(self, transactions: Iterable[Dict[str, Any]], now: Optional[datetime] = None):
+        """Add many transactions to recent history with a single trim
         
-        self.recent_transactions.append(tx_record)
+        Every record is stamped with ``now`` (one clock read by default), and
+        history beyond max_history is evicted once for the whole batch.
+        """
+        processed_at = now or datetime.now()
+        timestamp = processed_at.isoformat()
+        
+        # Build the records (and their hashes) before taking the lock
+        records = []
+        for transaction_data in transactions:
+            transaction_hash = self.generate_transaction_hash(transaction_data)
+            records.append({
+                'vendor': transaction_data.get('vendor'),
+                'amount': transaction_data.get('amount'),
+                'date': transaction_data.get('date'),
+                'transaction_type': transaction_data.get('transaction_type'),
+                'transaction_id': transaction_data.get('transaction_id'),
+                'sms_text': transaction_data.get('sms_text'),
+                'hash': transaction_hash,
+                'timestamp': timestamp,
+                'processed_at': processed_at
+            })
         
-        # Keep only recent transactions to prevent memory bloat
-        if len(self.recent_transactions) > self.max_history:
-            self.recent_transactions = self.recent_transactions[-self.max_history:]
+        with self._lock:
+            for tx_record in records:
+                self.recent_transactions.append(tx_record)
+                self._recent_hashes[tx_record['hash']] += 1
+                if tx_record['transaction_id']:
+                    self._recent_ids[tx_record['transaction_id']] += 1
+            
+            # Keep only recent transactions to prevent memory bloat
+            excess = len(self.recent_transactions) - self.max_history
+            if excess > 0:
+                for old_tx in self.recent_transactions[:excess]:
+                    self._forget(self._recent_hashes, old_tx['hash'])
+                    if old_tx['transaction_id']:
+                        self._forget(self._recent_ids, old_tx['transaction_id'])
+                del self.recent_transactions[:excess]
+    
+    @staticmethod
+    def _forget(index: Counter, key: str):
+        """Decrement a multiset index, dropping keys that reach zero"""
+        index[key] -= 1
+        if index[key] <= 0:
+            del index[key]
     
     def clear_history(self):
         """Clear transaction history"""
-        self.recent_transactions.clear()
+        with self._lock:
+            self.recent_transactions.clear()
+            self._recent_hashes.clear()
+            self._recent_ids.clear()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get deduplicator statistics"""
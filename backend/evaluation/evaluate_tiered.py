@@ -4,6 +4,7 @@ Compares accuracy across: Regex-only → ML → LLM tiers
 Generates comparative accuracy metrics for research paper
 """
 
+import asyncio
 import sys
 import os
 import json
@@ -123,7 +124,7 @@ class TieredEvaluator:
             return {"type": "OTHER", "amount": 0}, elapsed
         
         try:
-            result = ollama.parse_sms_transaction(sms)
+            result = asyncio.run(ollama.parse_sms_transaction(sms))
             elapsed = (time.time() - start) * 1000
             return result, elapsed
         except Exception as e:
@@ -9,6 +9,7 @@ Compares ACTUAL accuracy of:
 All 286 samples will be tested with REAL LLM calls.
 """
 
+import asyncio
 import sys
 import os
 import json
@@ -135,7 +136,7 @@ class RealFullComparison:
         
         try:
             # Call Ollama - returns nested structure
-            result = ollama.parse_sms_transaction(sms)
+            result = asyncio.run(ollama.parse_sms_transaction(sms))
             elapsed = (time.time() - start) * 1000
             
             # Check if parsing was successful
@@ -8,6 +8,7 @@ Tests Regex vs ML vs LLM on increasing sample sizes:
 Shows results after each batch so you can verify accuracy is improving.
 """
 
+import asyncio
 import sys
 import os
 import json
@@ -93,7 +94,7 @@ class ProgressiveTester:
     def llm_parse(self, sms: str) -> Dict[str, Any]:
         """LLM parsing with proper response handling"""
         try:
-            result = ollama.parse_sms_transaction(sms)
+            result = asyncio.run(ollama.parse_sms_transaction(sms))
             
             # Handle unsuccessful parse
             if not result.get("success", False):
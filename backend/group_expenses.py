@@ -3,7 +3,7 @@ Phase 6: Group Expenses Management
 Handles expense splitting and group financial management
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Session
 from database import Base
@@ -81,7 +81,6 @@ class GroupExpenseManager:
         )
         db.add(group)
         db.commit()
-        db.refresh(group)
         
         # Add creator as first member
         self.add_member(db, group.id, created_by, "Creator")
@@ -97,7 +96,6 @@ class GroupExpenseManager:
         )
         db.add(member)
         db.commit()
-        db.refresh(member)
         return member
     
     def add_expense(self, db: Session, group_id: int, paid_by: str, amount: float, 
@@ -130,7 +128,6 @@ class GroupExpenseManager:
         )
         db.add(expense)
         db.commit()
-        db.refresh(expense)
         
         # Calculate and create settlements
         self._create_settlements(db, expense, active_members, split_method, split_data)
@@ -141,43 +138,30 @@ class GroupExpenseManager:
                           members: List[GroupMember], split_method: str, split_data: Dict):
         """Create settlement records for an expense"""
         
+        debtors = [m for m in members if m.user_identifier != expense.paid_by]
+        
         if split_method == "equal":
             amount_per_person = expense.amount / len(members)
-            
-            for member in members:
-                if member.user_identifier != expense.paid_by:
-                    settlement = ExpenseSettlement(
-                        expense_id=expense.id,
-                        user_identifier=member.user_identifier,
-                        amount_owed=amount_per_person
-                    )
-                    db.add(settlement)
+            owed = [(m.user_identifier, amount_per_person) for m in debtors]
         
         elif split_method == "percentage" and split_data:
-            for member in members:
-                if member.user_identifier != expense.paid_by:
-                    percentage = split_data.get(member.user_identifier, 0)
-                    amount_owed = expense.amount * (percentage / 100)
-                    
-                    settlement = ExpenseSettlement(
-                        expense_id=expense.id,
-                        user_identifier=member.user_identifier,
-                        amount_owed=amount_owed
-                    )
-                    db.add(settlement)
+            owed = [
+                (m.user_identifier, expense.amount * (split_data.get(m.user_identifier, 0) / 100))
+                for m in debtors
+            ]
         
         elif split_method == "custom" and split_data:
-            for member in members:
-                if member.user_identifier != expense.paid_by:
-                    amount_owed = split_data.get(member.user_identifier, 0)
-                    
-                    settlement = ExpenseSettlement(
-                        expense_id=expense.id,
-                        user_identifier=member.user_identifier,
-                        amount_owed=amount_owed
-                    )
-                    db.add(settlement)
+            owed = [(m.user_identifier, split_data.get(m.user_identifier, 0)) for m in debtors]
+        
+        else:
+            owed = []
         
+        # One Core executemany instead of an ORM object per member
+        if owed:
+            db.execute(insert(ExpenseSettlement), [
+                {'expense_id': expense.id, 'user_identifier': user, 'amount_owed': amount}
+                for user, amount in owed
+            ])
         db.commit()
     
     def get_group_summary(self, db: Session, group_id: int) -> Dict:
@@ -270,7 +254,6 @@ class GroupExpenseManager:
             settlement.settled_at = datetime.utcnow()
         
         db.commit()
-        db.refresh(settlement)
         return settlement
     
     def get_user_groups(self, db: Session, user_identifier: str) -> List[Dict]:
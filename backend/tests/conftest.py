@@ -14,6 +14,9 @@ from sqlalchemy.pool import StaticPool
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Keep LLM parses from persisting across runs (settings are read at import)
+os.environ["SMS_PARSE_CACHE_PATH"] = ""
+
 from app.main import app
 from app.config.database import Base, get_db
 from app.models.user import User
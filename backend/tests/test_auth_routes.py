@@ -3,8 +3,10 @@ Test Authentication Endpoints
 Comprehensive tests for user registration, login, token management
 """
 import pytest
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
+from app.config.settings import settings
 
 
 @pytest.mark.auth
@@ -153,7 +155,44 @@ class TestAuthRoutes:
         data = response.json()
         assert data["full_name"] == "Updated Name"
         assert data["email"] == test_user.email
-    
+
+    def test_update_current_user_ignores_protected_fields(self, client: TestClient, test_db: Session, auth_headers, test_user):
+        """Test PUT /auth/me can't change password, tokens or account status"""
+        hashed_password = test_user.hashed_password
+        response = client.put(
+            "/v1/auth/me",
+            headers=auth_headers,
+            json={
+                "full_name": "Updated Name",
+                "hashed_password": "x",
+                "refresh_token": "x",
+                "is_active": False,
+                "is_verified": True,
+                "id": 999
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == test_user.id
+        assert data["is_active"] is True
+        assert data["is_verified"] is False
+
+        test_db.refresh(test_user)
+        assert test_user.full_name == "Updated Name"
+        assert test_user.hashed_password == hashed_password
+        assert test_user.refresh_token != "x"
+
+    def test_update_current_user_no_changes(self, client: TestClient, auth_headers, test_user):
+        """Test PUT /auth/me with nothing updatable returns the current user"""
+        response = client.put("/v1/auth/me", headers=auth_headers, json={"is_active": False})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["email"] == test_user.email
+        assert data["full_name"] == test_user.full_name
+        assert data["is_active"] is True
+
     def test_refresh_token(self, client: TestClient, test_db: Session, test_user):
         """Test POST /auth/refresh refreshes access token"""
         # First login to get refresh token
@@ -186,3 +225,27 @@ class TestAuthRoutes:
         response = client.post("/auth/logout", headers=auth_headers)
         
         assert response.status_code == 200
+    
+    def test_login_reuses_valid_refresh_token(self, test_db: Session, test_user):
+        """Test repeated logins reuse a still-valid refresh token"""
+        from app.controllers.auth_controller import AuthController
+        
+        first = AuthController.create_access_token_for_user(test_user, test_db)
+        second = AuthController.create_access_token_for_user(test_user, test_db)
+        
+        assert second["refresh_token"] == first["refresh_token"]
+        full_lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+        assert full_lifetime - 5 <= first["refresh_expires_in"] <= full_lifetime
+        
+        # A reused token reports the time it actually has left
+        test_user.refresh_token_expires_at = datetime.now(timezone.utc) + timedelta(days=2)
+        reused = AuthController.create_access_token_for_user(test_user, test_db)
+        assert reused["refresh_token"] == first["refresh_token"]
+        assert 2 * 86400 - 5 <= reused["refresh_expires_in"] <= 2 * 86400
+        
+        # Once the stored token is gone a fresh one is minted
+        test_user.refresh_token = None
+        third = AuthController.create_access_token_for_user(test_user, test_db)
+        assert third["refresh_token"]
+        assert test_user.refresh_token == third["refresh_token"]
+        assert full_lifetime - 5 <= third["refresh_expires_in"] <= full_lifetime
@@ -42,6 +42,39 @@ class TestChatbotRoutes:
         assert data["transaction_count"] == 0
         assert "no transactions" in data["response"].lower()
     
+    def test_chatbot_query_out_of_scope(self, client: TestClient, sample_transactions):
+        """Test non-financial queries get the default answer"""
+        response = client.post(
+            "/v1/chatbot/query",
+            json={"query": "Tell me a joke", "limit": 10}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["response"].startswith(f"I found {len(sample_transactions)} transactions")
+    
+    def test_chatbot_query_in_scope_reaches_model(self, client: TestClient, sample_transactions, monkeypatch):
+        """Test finance questions outside the analytics keywords still go to the model"""
+        from app.controllers import chatbot_controller
+
+        async def fake_model(prompt: str) -> str:
+            return "model answer"
+
+        monkeypatch.setattr(chatbot_controller, "get_ollama_response_fast", fake_model)
+        fallback = f"I found {len(sample_transactions)} transactions"
+        for query in [
+            "How much did I pay for rent?",
+            "salary this month",
+            "show my food purchases",
+            "What did I buy last week?",
+            "Which movie tickets did I book with UPI?",
+            "Where did my money go?",
+        ]:
+            response = client.post("/v1/chatbot/query", json={"query": query, "limit": 10})
+
+            assert response.status_code == 200
+            assert not response.json()["response"].startswith(fallback), query
+
     def test_chatbot_summary(self, client: TestClient, sample_transactions):
         """Test GET /v1/chatbot/summary"""
         response = client.get("/v1/chatbot/summary?days=30")
@@ -50,6 +83,18 @@ class TestChatbotRoutes:
         data = response.json()
         assert "summary" in data or "status" in data
     
+    def test_chatbot_summary_totals(self, client: TestClient, sample_transactions):
+        """Test GET /v1/chatbot/summary aggregates match the transactions"""
+        response = client.get("/v1/chatbot/summary?days=30")
+        
+        assert response.status_code == 200
+        summary = response.json()["summary"]
+        debits = [t for t in sample_transactions if t.transaction_type == "debit"]
+        assert summary["transaction_count"] == len(sample_transactions)
+        assert summary["total_spent"] == pytest.approx(sum(t.amount for t in debits))
+        assert summary["categories"]["Shopping"] == pytest.approx(1700.0)
+        assert summary["top_category"] == "Shopping"
+    
     def test_quick_insights(self, client: TestClient, sample_transactions):
         """Test POST /v1/chatbot/quick-insights"""
         response = client.post("/v1/chatbot/quick-insights")
@@ -0,0 +1,107 @@
+"""
+Test ParseResultStore
+On-disk SMS parse cache: round-trip, eviction, and failures read as misses
+"""
+import sqlite3
+import pytest
+from app.utils import parse_result_store
+from app.utils.parse_result_store import ParseResultStore
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the store module"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(parse_result_store.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.mark.unit
+class TestParseResultStore:
+    """Test the persistent parse-result cache"""
+
+    def test_round_trip(self, tmp_path):
+        """Test a stored parse is returned, also after reopening the file"""
+        path = str(tmp_path / "cache.db")
+        value = {"vendor": "SWIGGY", "amount": 250.0, "date": "2025-01-12"}
+        store = ParseResultStore(path)
+        store.set(b"k1", value)
+
+        assert store.get(b"k1") == value
+        assert store.get(b"missing") is None
+        store.close()
+
+        reopened = ParseResultStore(path)
+        assert reopened.get(b"k1") == value
+        reopened.close()
+
+    def test_expired_entries_evicted_on_write(self, tmp_path, clock):
+        """Test entries unused past max_age are dropped by a later write"""
+        store = ParseResultStore(str(tmp_path / "cache.db"), max_age_days=30)
+        store.set(b"old", {"amount": 1})
+
+        clock[0] += 31 * DAY
+        store.set(b"new", {"amount": 2})
+
+        assert store.get(b"old") is None
+        assert store.get(b"new") == {"amount": 2}
+        store.close()
+
+    def test_expired_entries_evicted_on_open(self, tmp_path, clock):
+        """Test reopening the store drops stale entries, keeping recent ones"""
+        path = str(tmp_path / "cache.db")
+        store = ParseResultStore(path, max_age_days=30)
+        store.set(b"old", {"amount": 1})
+        clock[0] += 20 * DAY
+        store.set(b"recent", {"amount": 2})
+        store.close()
+
+        clock[0] += 15 * DAY
+        reopened = ParseResultStore(path, max_age_days=30)
+        assert reopened.get(b"old") is None
+        assert reopened.get(b"recent") == {"amount": 2}
+        reopened.close()
+
+    def test_corrupt_file_reads_as_miss(self, tmp_path):
+        """Test a file that isn't a SQLite database never raises"""
+        path = tmp_path / "cache.db"
+        path.write_bytes(b"not a database" * 512)
+        store = ParseResultStore(str(path))
+
+        store.set(b"k1", {"amount": 1})
+        assert store.get(b"k1") is None
+        store.close()
+
+    def test_undecodable_value_reads_as_miss(self, tmp_path):
+        """Test a stored value that isn't JSON is treated as a miss"""
+        path = str(tmp_path / "cache.db")
+        store = ParseResultStore(path)
+        store.set(b"k1", {"amount": 1})
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE sms_parse_cache SET value = ? WHERE key = ?", (b"\xff{", b"k1"))
+        conn.commit()
+        conn.close()
+
+        assert store.get(b"k1") is None
+        store.close()
+
+    def test_locked_database_is_swallowed(self, tmp_path):
+        """Test a write blocked by another connection's lock is dropped, not raised"""
+        path = str(tmp_path / "cache.db")
+        store = ParseResultStore(path)
+        store.set(b"k1", {"amount": 1})
+        store._conn.execute("PRAGMA busy_timeout = 0")  # fail fast instead of waiting 5s
+
+        locker = sqlite3.connect(path, isolation_level=None)
+        locker.execute("BEGIN EXCLUSIVE")
+        try:
+            store.set(b"k2", {"amount": 2})
+        finally:
+            locker.execute("ROLLBACK")
+            locker.close()
+
+        assert store.get(b"k2") is None
+        assert store.get(b"k1") == {"amount": 1}
+        store.close()
@@ -0,0 +1,93 @@
+"""
+Test Security Utilities
+Password verification fast path and the verified-token cache
+"""
+import hashlib
+import pytest
+from passlib.context import CryptContext
+from passlib.hash import pbkdf2_sha256
+from app.auth import security
+from app.auth.security import _verify_pbkdf2_sha256, verify_password, verify_token, create_access_token
+
+PASSLIB = CryptContext(schemes=["pbkdf2_sha256"])
+HASH = pbkdf2_sha256.hash("correct horse")
+_, _, ROUNDS, SALT, CHECKSUM = HASH.split("$")
+PREFIX = "$pbkdf2-sha256$"
+
+
+def _passlib_verify(password, hashed):
+    """passlib's verdict, or the exception type it raises"""
+    try:
+        return PASSLIB.verify(password, hashed)
+    except (ValueError, TypeError) as e:
+        return type(e)
+
+
+@pytest.mark.unit
+class TestPasswordVerification:
+    """Test the pbkdf2_sha256 fast path against passlib"""
+
+    @pytest.mark.parametrize("password", ["correct horse", "wrong horse", ""])
+    def test_valid_hash_agrees_with_passlib(self, password):
+        """Test right and wrong passwords get passlib's answer"""
+        assert _verify_pbkdf2_sha256(password, HASH) is PASSLIB.verify(password, HASH)
+        assert verify_password(password, HASH) is PASSLIB.verify(password, HASH)
+
+    @pytest.mark.parametrize("hashed", [
+        PREFIX + f"{ROUNDS}${SALT}",                 # config string, no checksum
+        PREFIX + f"x${SALT}${CHECKSUM}",             # non-numeric rounds
+        PREFIX + f"0${SALT}${CHECKSUM}",             # zero rounds
+        PREFIX + f"0{ROUNDS}${SALT}${CHECKSUM}",     # zero-padded rounds
+        PREFIX + f"{ROUNDS}${SALT}$",                # empty checksum
+        PREFIX + f"{ROUNDS}${SALT}${CHECKSUM[:-2]}", # short checksum
+        PREFIX + f"{ROUNDS}$!!${CHECKSUM}",          # salt outside ab64
+        PREFIX + f"{ROUNDS}${SALT}${CHECKSUM}$x",    # extra field
+    ])
+    def test_malformed_hash_left_to_passlib(self, hashed):
+        """Test malformed hashes are not judged by the fast path, so passlib's outcome stands"""
+        assert _verify_pbkdf2_sha256("correct horse", hashed) is None
+        expected = _passlib_verify("correct horse", hashed)
+        if isinstance(expected, bool):
+            assert verify_password("correct horse", hashed) is expected
+        else:
+            with pytest.raises(expected):
+                verify_password("correct horse", hashed)
+
+    def test_other_schemes_fall_back_to_passlib(self, monkeypatch):
+        """Test a bcrypt hash is verified by passlib, not the fast path"""
+        bcrypt_hash = "$2b$12$KIXQJ3nBqzq4m8y7Dk5rQeY0u8m8m9w1mZp2cN3lP4oQ5rS6tU7vW"
+        calls = []
+
+        class FakeContext:
+            def verify(self, password, hashed):
+                calls.append((password, hashed))
+                return True
+
+        monkeypatch.setattr(security, "_get_pwd_context", lambda: FakeContext())
+
+        assert verify_password("bcrypt user password", bcrypt_hash) is True
+        assert calls == [("bcrypt user password", bcrypt_hash)]
+
+    def test_cache_keys_are_not_plain_digests(self):
+        """Test cached verifications can't be checked with an unkeyed hash"""
+        verify_password("correct horse", HASH)
+        plain = hashlib.sha256(b"correct horse|" + HASH.encode()).digest()
+
+        assert plain not in security._pw_cache
+        assert len(security._pw_cache) > 0
+
+
+@pytest.mark.unit
+class TestVerifyToken:
+    """Test the verified-token cache"""
+
+    def test_cached_payload_is_not_shared(self):
+        """Test mutating one caller's payload doesn't leak into the next call"""
+        token = create_access_token({"sub": "user@example.com"})
+        first = verify_token(token)
+        first["sub"] = "attacker@example.com"
+        first["type"] = "refresh"
+
+        second = verify_token(token)
+        assert second["sub"] == "user@example.com"
+        assert second["type"] == "access"
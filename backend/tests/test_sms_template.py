@@ -0,0 +1,90 @@
+"""
+Test SMS Templates
+Replaying one SMS's LLM parse onto another SMS from the same template
+"""
+import pytest
+from app.utils.sms_template import template_key, make_template, fill_template
+
+SMS = "Rs.250.00 debited from A/c XX1234 on 12/01/25 to SWIGGY. Avl Bal Rs.5,000.00"
+PARSED = {
+    "vendor": "SWIGGY",
+    "amount": 250.0,
+    "date": "2025-01-12",
+    "account_number": "1234",
+    "transaction_type": "debit",
+    "confidence": 0.9,
+}
+
+
+@pytest.mark.unit
+class TestSMSTemplate:
+    """Test make_template / fill_template"""
+
+    def test_substitutes_amount_date_and_account(self):
+        """Test a second SMS of the same template gets its own amount, date and account"""
+        other = "Rs.1,299.50 debited from A/c XX9876 on 03/02/25 to SWIGGY. Avl Bal Rs.3,700.50"
+        assert template_key(other) == template_key(SMS)
+
+        filled = fill_template(make_template(PARSED, SMS), other)
+
+        assert filled == {
+            "vendor": "SWIGGY",
+            "amount": 1299.5,
+            "date": "2025-02-03",
+            "account_number": "9876",
+            "transaction_type": "debit",
+            "confidence": 0.9,
+        }
+
+    def test_replay_onto_source_sms_is_identity(self):
+        """Test filling the template from its own SMS reproduces the parse"""
+        assert fill_template(make_template(PARSED, SMS), SMS) == PARSED
+
+    def test_int_amount_keeps_its_type(self):
+        """Test an integer amount stays an int when the new token is whole"""
+        parsed = dict(PARSED, amount=250)
+        other = "Rs.75 debited from A/c XX1234 on 12/01/25 to SWIGGY. Avl Bal Rs.5,000.00"
+        template = make_template(parsed, SMS.replace("Rs.250.00", "Rs.250"))
+
+        assert fill_template(template, other)["amount"] == 75
+
+    def test_mismatched_token_count_returns_none(self):
+        """Test an SMS with more or fewer numbers than the template doesn't fill"""
+        template = make_template(PARSED, SMS)
+
+        assert fill_template(template, SMS + " Ref 501234567890") is None
+        assert fill_template(template, SMS.replace(" Avl Bal Rs.5,000.00", "")) is None
+
+    def test_unparseable_date_token_returns_none(self):
+        """Test a date slot holding an impossible date doesn't fill"""
+        template = make_template(PARSED, SMS)
+
+        assert fill_template(template, SMS.replace("12/01/25", "45/13/25")) is None
+
+    def test_ambiguous_amount_not_pinned(self):
+        """Test an amount that appears twice (amount == balance) yields no template"""
+        sms = "Rs.500.00 debited from A/c XX1234 on 12/01/25 to SWIGGY. Avl Bal Rs.500.00"
+
+        assert make_template(dict(PARSED, amount=500.0), sms) is None
+
+    def test_ambiguous_field_not_pinned(self):
+        """Test any digit-bearing field matching two tokens yields no template"""
+        sms = "Rs.250.00 debited from A/c XX1234 on 12/01/25 to SWIGGY. Ref 1234"
+
+        assert make_template(PARSED, sms) is None
+
+    def test_ambiguous_date_not_pinned(self):
+        """Test a date that occurs twice yields no template"""
+        sms = "Rs.250.00 debited from A/c XX1234 on 12/01/25 to SWIGGY. Value date 12-01-2025"
+
+        assert make_template(PARSED, sms) is None
+
+    def test_field_missing_from_text_not_pinned(self):
+        """Test a parsed number that isn't in the SMS yields no template"""
+        assert make_template(dict(PARSED, account_number="5678"), SMS) is None
+
+    def test_requires_amount_slot(self):
+        """Test a parse without an amount is never templated"""
+        parsed = {key: value for key, value in PARSED.items() if key != "amount"}
+
+        assert make_template(parsed, SMS) is None
@@ -5,6 +5,7 @@ Comprehensive tests for transaction CRUD, SMS parsing, search
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
 
 
 @pytest.mark.transactions
@@ -27,6 +28,115 @@ class TestTransactionRoutes:
         assert "confidence" in data
         assert data["amount"] > 0
     
+    def test_parse_sms_local_duplicate_fingerprint(self, client: TestClient, auth_headers, sample_sms_messages):
+        """Test POST /v1/parse-sms-local rejects a resent SMS with 409"""
+        payload = {"sms_text": sample_sms_messages[0], "sender": "AD-HDFCBK", "device_timestamp": 1735000000000}
+        first = client.post("/v1/parse-sms-local", headers=auth_headers, json=payload)
+        second = client.post("/v1/parse-sms-local", headers=auth_headers, json=payload)
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert second.json()["detail"] == "Duplicate SMS (fingerprint match)"
+
+    def test_parse_sms_local_resend_without_fingerprint(self, client: TestClient, auth_headers, sample_sms_messages):
+        """Test POST /v1/parse-sms-local rejects a resent SMS that has no sender/timestamp"""
+        from app.controllers.transaction_controller import transaction_controller
+        payload = {"sms_text": sample_sms_messages[1]}
+        transaction_controller.deduplicator.clear_history()
+        first = client.post("/v1/parse-sms-local", headers=auth_headers, json=payload)
+        # Forget the in-memory copy so the database check is what rejects it
+        transaction_controller.deduplicator.clear_history()
+        second = client.post("/v1/parse-sms-local", headers=auth_headers, json=payload)
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert second.json()["detail"] == "SMS already processed for this user"
+
+    def test_legacy_rows_get_sms_digest(self, client: TestClient, test_db: Session, auth_headers,
+                                        test_user, sample_sms_messages):
+        """Test create_all upgrades a table without sms_digest so old SMS still dedup"""
+        from sqlalchemy import text
+        from app.config.database import Base
+        from app.controllers.transaction_controller import transaction_controller
+        test_db.execute(text("DROP INDEX idx_user_sms_digest"))
+        test_db.execute(text("ALTER TABLE transactions DROP COLUMN sms_digest"))
+        test_db.execute(
+            text("INSERT INTO transactions (user_id, vendor, amount, sms_text) VALUES (:user_id, 'Swiggy', 350.0, :sms)"),
+            {"user_id": test_user.id, "sms": sample_sms_messages[1]}
+        )
+        test_db.commit()
+
+        Base.metadata.create_all(bind=test_db.get_bind())
+        transaction_controller.deduplicator.clear_history()
+
+        response = client.post("/v1/parse-sms-local", headers=auth_headers, json={"sms_text": sample_sms_messages[1]})
+        assert response.status_code == 409
+        assert response.json()["detail"] == "SMS already processed for this user"
+
+    def test_parse_sms_batch_local(self, client: TestClient, auth_headers, sample_sms_messages):
+        """Test POST /v1/parse-sms-batch-local stores a batch and skips in-batch duplicates"""
+        messages = [
+            {"sms_text": sms, "sender": "AD-HDFCBK", "device_timestamp": 1735000000000 + i}
+            for i, sms in enumerate(sample_sms_messages)
+        ]
+        messages.append(dict(messages[0]))  # exact resend of the first SMS
+        
+        response = client.post(
+            "/v1/parse-sms-batch-local",
+            headers=auth_headers,
+            json={"sms_messages": messages}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["transactions"]) + data["failed"] == len(messages)
+        assert "Duplicate SMS within batch" in data["errors"]
+        assert data["transactions"] and all(t["id"] for t in data["transactions"])
+        
+        listed = client.get("/v1/transactions", headers=auth_headers).json()
+        assert {t["id"] for t in data["transactions"]} <= {t["id"] for t in listed}
+    
+    def test_parse_sms_promotional_rejected(self, client: TestClient, auth_headers):
+        """Test POST /v1/parse-sms rejects promotional SMS before any LLM call"""
+        response = client.post(
+            "/v1/parse-sms",
+            headers=auth_headers,
+            json={"sms_text": "Congratulations! You are a winner. Get 50% discount and free cashback on your next order. Offer valid till Sunday."}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("SMS filtered out")
+
+    def test_parse_sms_bank_template(self, client: TestClient, auth_headers):
+        """Test POST /v1/parse-sms parses a known bank template without the LLM"""
+        response = client.post(
+            "/v1/parse-sms",
+            headers=auth_headers,
+            json={"sms_text": "Sent Rs.250.00 From HDFC Bank A/C *1234 To SWIGGY On 12/01/25 Ref 501234567890"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["vendor"] == "SWIGGY"
+        assert data["amount"] == 250.0
+        assert data["date"].startswith("2025-01-12")
+        assert data["category"] == "Food & Dining"
+
+    def test_parse_sms_batch_rejects_promotional(self, client: TestClient, auth_headers):
+        """Test POST /v1/parse-sms-batch reports per-SMS rejections without storing anything"""
+        promo = "Congratulations! You are a winner. Get 50% discount and free cashback on your next order. Offer valid till Sunday."
+        response = client.post(
+            "/v1/parse-sms-batch",
+            headers=auth_headers,
+            json={"sms_messages": [{"sms_text": promo}, {"sms_text": promo + " Hurry!"}]}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["transactions"] == []
+        assert data["failed"] == 2
+        assert all(error.startswith("SMS filtered out") for error in data["errors"])
+    
     def test_parse_sms_unauthorized(self, client: TestClient, sample_sms_messages):
         """Test SMS parsing without authentication fails"""
         response = client.post(
@@ -57,7 +167,20 @@ class TestTransactionRoutes:
         data = response.json()
         assert isinstance(data, list)
         assert len(data) <= 3
-    
+
+    def test_get_transactions_before_id(self, client: TestClient, auth_headers, sample_transactions):
+        """Test GET /v1/transactions seeks past before_id without overlap"""
+        first = client.get("/v1/transactions?limit=2", headers=auth_headers).json()
+        response = client.get(
+            f"/v1/transactions?limit=100&before_id={first[-1]['id']}",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        rest = response.json()
+        assert all(t['id'] < first[-1]['id'] for t in rest)
+        assert len(first) + len(rest) == len(sample_transactions)
+
     def test_get_transactions_unauthorized(self, client: TestClient):
         """Test getting transactions without authentication"""
         response = client.get("/v1/transactions")
@@ -193,6 +316,77 @@ class TestTransactionRoutes:
         # Should find Amazon transaction
         assert any("Amazon" in tx["vendor"] for tx in data)
     
+    def test_search_matches_ilike(self, client: TestClient, test_db: Session, auth_headers, sample_transactions):
+        """Test GET /v1/search returns the same rows as vendor/category ILIKE"""
+        from sqlalchemy import or_, select
+
+        user_id = sample_transactions[0].user_id
+        # Trigram MATCH (3+ chars) and the short-query ILIKE fallback alike
+        for q in ["amazon", "AMAZON", "maz", "Food &", "dining", "hop", "Sw", "z", "Test SMS", "no-such-vendor"]:
+            expected = set(test_db.scalars(
+                select(Transaction.id).where(
+                    Transaction.user_id == user_id,
+                    or_(Transaction.vendor.ilike(f"%{q}%"), Transaction.category.ilike(f"%{q}%"))
+                )
+            ))
+            response = client.get("/v1/search", params={"q": q, "limit": 100}, headers=auth_headers)
+
+            assert response.status_code == 200
+            assert {tx["id"] for tx in response.json()} == expected, q
+
+    def test_search_user_isolation(self, client: TestClient, test_db: Session,
+                                   auth_headers, sample_transactions, another_user):
+        """Test GET /v1/search only returns the caller's transactions"""
+        from app.controllers.auth_controller import AuthController
+        other = Transaction(user_id=another_user.id, vendor="Amazon Prime", amount=99.0, category="Shopping")
+        test_db.add(other)
+        test_db.commit()
+        token_data = AuthController.create_access_token_for_user(another_user, test_db)
+        another_headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+
+        mine = client.get("/v1/search?q=amazon", headers=auth_headers).json()
+        theirs = client.get("/v1/search?q=amazon", headers=another_headers).json()
+
+        assert other.id not in {tx["id"] for tx in mine}
+        assert sample_transactions[0].id in {tx["id"] for tx in mine}
+        assert [tx["id"] for tx in theirs] == [other.id]
+
+    def test_search_follows_update_and_delete(self, client: TestClient, auth_headers, sample_transactions):
+        """Test the search index tracks vendor/category edits and deletions"""
+        amazon, flipkart = sample_transactions[0], sample_transactions[5]
+        assert client.put(f"/v1/transactions/{amazon.id}", headers=auth_headers,
+                          json={"vendor": "Myntra", "category": "Apparel"}).status_code == 200
+        assert client.delete(f"/v1/transactions/{flipkart.id}", headers=auth_headers).status_code == 200
+
+        def search(q):
+            return {tx["id"] for tx in client.get(f"/v1/search?q={q}", headers=auth_headers).json()}
+
+        assert amazon.id not in search("amazon")
+        assert amazon.id in search("myntra")
+        assert amazon.id in search("appar")
+        # Amazon and Flipkart were the only Shopping rows
+        assert search("shopping") == set()
+        assert search("flipkart") == set()
+
+    def test_search_index_rebuilt_for_legacy_db(self, client: TestClient, test_db: Session,
+                                                auth_headers, sample_transactions):
+        """Test create_all indexes rows written before the search index existed"""
+        from sqlalchemy import text
+        from app.config.database import Base
+        for name in ("transactions_fts_ai", "transactions_fts_ad", "transactions_fts_au"):
+            test_db.execute(text(f"DROP TRIGGER {name}"))
+        test_db.execute(text("DROP TABLE transactions_fts"))
+        legacy = Transaction(user_id=sample_transactions[0].user_id, vendor="Legacy Store", amount=10.0)
+        test_db.add(legacy)
+        test_db.commit()
+
+        Base.metadata.create_all(bind=test_db.get_bind())
+
+        assert [tx["id"] for tx in client.get("/v1/search?q=legacy", headers=auth_headers).json()] == [legacy.id]
+        assert sample_transactions[1].id in {
+            tx["id"] for tx in client.get("/v1/search?q=swiggy", headers=auth_headers).json()
+        }
+
     def test_ml_info(self, client: TestClient):
         """Test GET /v1/ml-info returns model information"""
         response = client.get("/v1/ml-info")
@@ -203,3 +397,51 @@ class TestTransactionRoutes:
         assert "categories" in data
         assert "capabilities" in data
         assert isinstance(data["categories"], list)
+
+
+@pytest.mark.unit
+class TestSMSParseInflight:
+    """Test sharing of in-flight LLM parses"""
+
+    def test_inflight_parse_not_shared_across_event_loops(self, monkeypatch):
+        """Test an SMS already parsing on one loop is parsed afresh on another"""
+        import asyncio
+        import threading
+        import time
+        from app.controllers import transaction_controller as controller_module
+
+        release = threading.Event()
+        calls = []
+
+        async def fake_parse(sms_text):
+            calls.append(sms_text)
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            return {"success": False, "amount": None}
+
+        monkeypatch.setattr(controller_module, "classify_and_parse_sms", fake_parse)
+        controller = controller_module.TransactionController()
+        sms = "Rs.250.00 debited from A/c XX1234 on 12/01/25 to SWIGGY"
+        results = {}
+
+        def parse_in_new_loop(name):
+            try:
+                results[name] = asyncio.run(controller._classify_and_parse_cached(sms))
+            except Exception as e:
+                results[name] = e
+
+        threads = [threading.Thread(target=parse_in_new_loop, args=(name,)) for name in ("first", "second")]
+        threads[0].start()
+        while not calls:
+            time.sleep(0.01)
+        # The first parse is still in flight while the second loop asks for it
+        threads[1].start()
+        threads[1].join(0.5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 2
+        assert results == {"first": {"success": False, "amount": None},
+                           "second": {"success": False, "amount": None}}
+        assert controller._sms_inflight == {}